@@ -7,9 +7,9 @@ __all__ = ['BebobConfigRomParser']
 
 
 class BebobConfigRomParser(Ieee1394ConfigRomParser):
-    def parse_rom(self, data):
-        entries = super().parse_rom(data)
-        return self.__parse_entries(entries['root-directory'])
+    def parse_entries(self, entries):
+        info = super().parse_entries(entries)
+        return self.__parse_entries(info['root-directory'])
 
     def __parse_entries(self, entries):
         # Typical layout.
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from hinawa_utils.ta1394.ccm import AvcCcm
+
+__all__ = ['ConnectionEngine']
+
+
+class ConnectionEngine():
+    # Every pair of source and destination is inquired to the unit once for
+    # firmware, since the type of plug is reported by vendor's firmware and
+    # gives no proof that a pair can not be connected. Definite answers of
+    # the inquiry are kept in the topology and saved into its cache file, thus
+    # later runs for the same firmware use them without transaction. The
+    # current source of each destination is retrieved at each call.
+    #
+    # The answers of inquiry which are cached as unavailable.
+    UNAVAILABLE_ANSWERS = ('Not Implemented', 'Rejected')
+
+    def __init__(self, fcp, topology):
+        self.__fcp = fcp
+        self.__topology = topology
+        self.__cache = topology.connections
+        self.__updated = False
+        self.stats = {
+            'candidates':   0,
+            'cached':       0,
+            'inquiries':    0,
+            'failures':     0,
+        }
+
+        self.__sources = []
+        self.__destinations = []
+
+        for seqid, info in topology.unit_plugs.items():
+            data = info['data']
+            addr = AvcCcm.get_unit_signal_addr(data['unit-type'], data['plug'])
+            self.__add_plug(seqid, addr, info['dir'] == 'output')
+
+        for seqid, info in topology.subunit_plugs.items():
+            data = info['data']
+            addr = AvcCcm.get_subunit_signal_addr(data['subunit-type'],
+                                                  data['subunit-id'],
+                                                  data['plug'])
+            # Inverse direction against plugs of unit.
+            self.__add_plug(seqid, addr, info['dir'] == 'input')
+
+    def __add_plug(self, seqid, addr, is_destination):
+        if is_destination:
+            self.__destinations.append((seqid, bytes(addr)))
+        else:
+            self.__sources.append((seqid, bytes(addr)))
+
+    def ask(self, src_addr, dst_addr):
+        # Failures of transaction and the other responses are not cached,
+        # thus inquired again at next call.
+        key = (bytes(src_addr), bytes(dst_addr))
+        if key in self.__cache:
+            self.stats['cached'] += 1
+            return self.__cache[key]
+
+        self.stats['inquiries'] += 1
+        try:
+            AvcCcm.ask_signal_source(self.__fcp, key[0], key[1])
+            self.__cache[key] = True
+        except OSError as e:
+            if str(e) not in self.UNAVAILABLE_ANSWERS:
+                self.stats['failures'] += 1
+                return False
+            self.__cache[key] = False
+        except Exception:
+            self.stats['failures'] += 1
+            return False
+        self.__updated = True
+        return self.__cache[key]
+
+    def get_avail_connections(self):
+        # The same structure as BebobUnit.get_avail_connections() is
+        # returned.
+        avail = {}
+
+        for dst_seqid, dst_addr in self.__destinations:
+            try:
+                curr_src_info = AvcCcm.get_signal_source(self.__fcp, dst_addr)
+            except:
+                curr_src_info = None
+
+            self.stats['candidates'] += len(self.__sources)
+
+            for src_seqid, src_addr in self.__sources:
+                if not self.ask(src_addr, dst_addr):
+                    continue
+
+                if dst_seqid not in avail:
+                    avail[dst_seqid] = []
+
+                src_info = AvcCcm.parse_signal_addr(src_addr)
+                avail[dst_seqid].append((src_seqid, src_info == curr_src_info))
+
+        if self.__updated:
+            self.__topology.store()
+            self.__updated = False
+
+        return avail
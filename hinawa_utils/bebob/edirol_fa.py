@@ -12,7 +12,7 @@ __all__ = ['EdirolFaUnit']
 
 
 class EdirolFaUnit(BebobUnit):
-    _FBS = {
+    FBS = {
         # Edirol FA-66.
         (0x0040ab, 0x010049): (
             'analog-in-1/2',
@@ -29,11 +29,11 @@ class EdirolFaUnit(BebobUnit):
         ),
     }
 
-    def __init__(self, path):
-        super().__init__(path)
-        if (self.vendor_id, self.model_id) not in self._FBS:
+    def __init__(self, path, info=None):
+        super().__init__(path, info)
+        if (self.vendor_id, self.model_id) not in self.FBS:
             raise OSError('Not supported.')
-        self._fbs = self._FBS[(self.vendor_id, self.model_id)]
+        self._fbs = self.FBS[(self.vendor_id, self.model_id)]
 
     def get_mixer_input_labels(self):
         return self._fbs
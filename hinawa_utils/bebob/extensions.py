@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from hinawa_utils.ta1394.general import AvcGeneral
+from hinawa_utils.ta1394.general import AvcGeneral, AvcCommandTemplate
 from hinawa_utils.ta1394.streamformat import AvcStreamFormatInfo
 
 import time
@@ -10,6 +10,18 @@ __all__ = ['BcoPlugInfo', 'BcoSubunitInfo', 'BcoVendorDependent',
            'BcoStreamFormatInfo']
 
 
+# The address consists of 6 bytes. The last byte is for subunit address of
+# command and the others are for plug address in operand.
+def _plug_info_template(name, info_type, operand=0xff):
+    return AvcCommandTemplate(name, (
+        0x01, 'subunit',
+        0x02,   # Plug info command
+        0xc0,   # Bco plug info subcommand
+        ('addr', 5),
+        info_type, operand, 0xff,
+    ))
+
+
 class BcoPlugInfo():
     ADDR_DIR = ('input', 'output')
     ADDR_MODE = ('unit', 'subunit', 'function-block')
@@ -25,6 +37,16 @@ class BcoPlugInfo():
     PORT_TYPE = ('speaker', 'headphone', 'microphone', 'line', 'spdif',
                  'adat', 'tdif', 'madi', 'analog', 'digital', 'MIDI', 'no-type')
 
+    _GET_PLUG_TYPE = _plug_info_template('bco-plug-type', 0x00)
+    _GET_PLUG_NAME = _plug_info_template('bco-plug-name', 0x01)
+    _GET_PLUG_CHANNELS = _plug_info_template('bco-plug-channels', 0x02)
+    _GET_PLUG_CLUSTERS = _plug_info_template('bco-plug-clusters', 0x03)
+    _GET_PLUG_CH_NAME = _plug_info_template('bco-plug-ch-name', 0x04, 'pos')
+    _GET_PLUG_INPUT = _plug_info_template('bco-plug-input', 0x05)
+    _GET_PLUG_OUTPUTS = _plug_info_template('bco-plug-outputs', 0x06)
+    _GET_PLUG_CLUSTER_INFO = _plug_info_template('bco-plug-cluster-info', 0x07,
+                                                 'cluster')
+
     @classmethod
     def get_unit_addr(cls, addr_dir, addr_unit_type, plug):
         if addr_dir not in cls.ADDR_DIR:
@@ -146,42 +168,21 @@ class BcoPlugInfo():
         info['data'] = data
         return info
 
+    @classmethod
+    def __query(cls, template, fcp, addr, **values):
+        return template.execute(fcp, subunit=addr[5], addr=addr[0:5],
+                                **values)
+
     @classmethod
     def get_plug_type(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x00)   # Info type is 'type'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_TYPE, fcp, addr)
         if params[10] > len(cls.PLUG_TYPE):
             raise OSError('Unexpected value in response')
         return cls.PLUG_TYPE[params[10]]
 
     @classmethod
     def get_plug_name(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x01)   # Info type is 'name'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_NAME, fcp, addr)
         length = params[10]
         if length == 0:
             return ""
@@ -189,57 +190,18 @@ class BcoPlugInfo():
 
     @classmethod
     def get_plug_channels(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x02)   # Info type is 'the number of channels'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_CHANNELS, fcp, addr)
         return params[10]
 
     @classmethod
     def get_plug_ch_name(cls, fcp, addr, pos):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x04)   # Info type is 'channel position name'
-        args.append(pos)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_CH_NAME, fcp, addr, pos=pos)
         length = params[11]
         return params[12:12 + length].decode()
 
     @classmethod
     def get_plug_clusters(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x03)   # Info type is 'channel position data'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_CLUSTERS, fcp, addr)
         data = params[10:]
         pos = 0
         clusters = [[] for i in range(data[pos])]
@@ -259,57 +221,19 @@ class BcoPlugInfo():
 
     @classmethod
     def get_plug_cluster_info(cls, fcp, addr, cluster):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x07)   # Info type is 'cluster info'
-        args.append(cluster)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_CLUSTER_INFO, fcp, addr,
+                             cluster=cluster)
         length = params[12]
         return params[13:13 + length].decode()
 
     @classmethod
     def get_plug_input(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x05)   # Info type is 'input data'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_INPUT, fcp, addr)
         return cls.parse_plug_addr(params[10:])
 
     @classmethod
     def get_plug_outputs(cls, fcp, addr):
-        args = bytearray()
-        args.append(0x01)
-        args.append(addr[5])
-        args.append(0x02)   # Plug info command
-        args.append(0xc0)   # Bco plug info subcommand
-        args.append(addr[0])
-        args.append(addr[1])
-        args.append(addr[2])
-        args.append(addr[3])
-        args.append(addr[4])
-        args.append(0x06)   # Info type is 'output data'
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls.__query(cls._GET_PLUG_OUTPUTS, fcp, addr)
         info = []
         plugs = params[10]
         if plugs != 0xff:
@@ -532,7 +456,12 @@ class BcoStreamFormatInfo():
                   'reserved')       # the others
 
     @classmethod
-    def get_entry_list(cls, fcp, addr):
+    def get_entry_list(cls, fcp, addr, formats=None):
+        # The response includes no hint about the length of list, thus
+        # entries are retrieved till the unit rejects the index. The plug
+        # which does not support the command is reported by the first
+        # request. When a dictionary is given, the same formats are parsed
+        # once between entries and between calls, and callers get copies.
         fmts = []
         for i in range(0xff):
             # DM1500 tends to cause timeout.
@@ -552,33 +481,56 @@ class BcoStreamFormatInfo():
                 args.append(i)
                 args.append(0xff)
                 params = AvcGeneral.command_status(fcp, args)
-                fmts.append(cls._parse_format(params[11:]))
             except OSError as e:
-                if str(e) != 'Rejected':
-                    raise
-                else:
+                if str(e) == 'Rejected':
                     break
+                if str(e) == 'Not implemented' and i > 0:
+                    break
+                raise
+
+            if formats is None:
+                fmts.append(cls._parse_format(params[11:]))
+                continue
+            key = bytes(params[11:])
+            if key not in formats:
+                formats[key] = cls._parse_format(key)
+            fmts.append(cls.copy_format(formats[key]))
         return fmts
 
+    @classmethod
+    def copy_format(cls, fmt):
+        fmt = dict(fmt)
+        fmt['formation'] = list(fmt['formation'])
+        return fmt
+
     # Two types of sync stream: 0x90/0x00/0x40 and 0x90/0x40 with 'sync-stream'
     @classmethod
     def _parse_format(cls, params):
+        # Codes out of the tables and truncated responses are unsupported.
+        rates = AvcStreamFormatInfo.SAMPLING_RATES
+        ctls = AvcStreamFormatInfo.RATE_CONTROLS
+        if len(params) < 5:
+            raise RuntimeError('Unsupported format')
         fmt = {}
         # Sync stream with stereo raw audio
         if params[0] == 0x90 and params[1] == 0x00 and params[2] == 0x40:
             ctl = params[4] & 0x01
             rate = params[4] >> 8
             fmt['type'] = 'Sync'
-            fmt['rate-control'] = AvcStreamFormatInfo.RATE_CONTROLS[ctl]
-            fmt['sampling-rate'] = AvcStreamFormatInfo.SAMPLING_RATES[rate]
+            fmt['rate-control'] = ctls[ctl]
+            fmt['sampling-rate'] = rates[rate]
             fmt['formation'] = ['multi-bit-linear-audio-raw']
             return fmt
         if params[0] != 0x90 or params[1] != 0x40:
             raise RuntimeError('Unsupported format')
-        fmt['type'] = 'Compound'
-        fmt['sampling-rate'] = AvcStreamFormatInfo.SAMPLING_RATES[params[2]]
         ctl = params[3] & 0x3
-        fmt['rate-control'] = AvcStreamFormatInfo.RATE_CONTROLS[ctl]
+        if params[2] >= len(rates) or ctl >= len(ctls):
+            raise RuntimeError('Unsupported format')
+        if len(params) < 5 + params[4] * 2:
+            raise RuntimeError('Unsupported format')
+        fmt['type'] = 'Compound'
+        fmt['sampling-rate'] = rates[params[2]]
+        fmt['rate-control'] = ctls[ctl]
         formation = []
         for i in range(params[4]):
             for c in range(params[5 + i * 2]):
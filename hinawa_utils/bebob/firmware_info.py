@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from collections import namedtuple
+from struct import Struct
+
+__all__ = ['BebobFirmwareInfo']
+
+
+_FIELDS = (
+    'manufacturer',
+    'protocol_version',
+    'guid',
+    'model_id',
+    'model_revision',
+    'software_build_date',
+    'software_build_time',
+    'software_id',
+    'software_version',
+    'software_base_address',
+    'software_max_size',
+    'bootloader_build_date',
+    'bootloader_build_time',
+    'debugger_build_date',
+    'debugger_build_time',
+    'debugger_id',
+    'debugger_version',
+)
+
+
+class BebobFirmwareInfo(namedtuple('BebobFirmwareInfo', _FIELDS)):
+    # The block of information in the address space of BeBoB unit, decoded
+    # by single call with precompiled layout.
+    __slots__ = ()
+
+    SIZE = 104
+
+    # The high and low parts of GUID are 8 and 4 bytes for legacy reason, and
+    # 2 bytes after software build time are padding.
+    __LAYOUT = Struct('<8sIQIII8s6s2xIIII8s8s8s8sII')
+
+    @staticmethod
+    def __get_string_literal(params):
+        if 0x00 in params:
+            return '00000000'
+        return params.decode('US-ASCII')
+
+    @staticmethod
+    def __get_time_literal(params):
+        if 0x00 in params:
+            return '000000'
+        return params.decode('US-ASCII')
+
+    @classmethod
+    def parse(cls, params):
+        if len(params) < cls.SIZE:
+            raise ValueError('Invalid length of firmware information.')
+
+        (manufacturer, protocol_version, guid_high, guid_low, model_id,
+         model_revision, sw_date, sw_time, sw_id, sw_version,
+         sw_base_address, sw_max_size, bl_date, bl_time, dbg_date, dbg_time,
+         dbg_id, dbg_version) = cls.__LAYOUT.unpack_from(params)
+
+        return cls(cls.__get_string_literal(manufacturer),
+                   protocol_version,
+                   (guid_high << 32) | guid_low,
+                   model_id,
+                   model_revision,
+                   cls.__get_string_literal(sw_date),
+                   cls.__get_time_literal(sw_time),
+                   sw_id,
+                   sw_version,
+                   sw_base_address,
+                   sw_max_size,
+                   cls.__get_string_literal(bl_date),
+                   cls.__get_time_literal(bl_time),
+                   cls.__get_string_literal(dbg_date),
+                   cls.__get_string_literal(dbg_time),
+                   dbg_id,
+                   dbg_version)
+
+    def get_dict(self):
+        return {
+            'manufacturer':     self.manufacturer,
+            'protocol-version': self.protocol_version,
+            'guid':             self.guid,
+            'model-id':         self.model_id,
+            'model-revision':   self.model_revision,
+            'software': {
+                'build-date':   self.software_build_date,
+                'build-time':   self.software_build_time,
+                'id':           self.software_id,
+                'version':      self.software_version,
+                'base-address': self.software_base_address,
+                'max-size':     self.software_max_size,
+            },
+            'bootloader': {
+                'build-date':   self.bootloader_build_date,
+                'build-time':   self.bootloader_build_time,
+            },
+            'debugger': {
+                'build-date':   self.debugger_build_date,
+                'build-time':   self.debugger_build_time,
+                'id':           self.debugger_id,
+                'version':      self.debugger_version,
+            },
+        }
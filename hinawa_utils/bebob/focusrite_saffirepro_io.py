@@ -3,10 +3,6 @@
 
 from struct import pack, unpack
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 from hinawa_utils.bebob.bebob_unit import BebobUnit
 from hinawa_utils.ta1394.audio import AvcAudio
 from hinawa_utils.ta1394.general import AvcConnection
@@ -124,25 +120,11 @@ class FocusriteSaffireproIoUnit(BebobUnit):
         for i in range(count):
             frames.extend(pack('>I', quads[0]))
             quads = quads[1:]
-        req = Hinawa.FwReq()
-        if len(frames) == 4:
-            tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
-        req.transaction(self.get_node(), tcode,
-                        self._BASE_ADDR + offset, len(frames), frames)
+        self.trx.write(self._BASE_ADDR + offset, frames)
 
     def _read_quads(self, offset, count):
         quads = []
-        req = Hinawa.FwReq()
-        size = count * 4
-        if size == 4:
-            tcode = Hinawa.FwTcode.READ_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.READ_BLOCK_REQUEST
-        frames = bytearray(size)
-        frames = req.transaction(self.get_node(), tcode,
-                                 self._BASE_ADDR + offset, size, frames)
+        frames = self.trx.read(self._BASE_ADDR + offset, count * 4)
         for i in range(count):
             quads.append(unpack('>I', frames[0:4])[0])
             frames = frames[4:]
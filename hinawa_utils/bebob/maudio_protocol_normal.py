@@ -4,10 +4,6 @@
 from re import match
 from struct import unpack
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 from hinawa_utils.bebob.maudio_protocol_abstract import MaudioProtocolAbstract
 
 from hinawa_utils.ta1394.general import AvcConnection
@@ -433,11 +429,8 @@ class MaudioProtocolNormal(MaudioProtocolAbstract):
     def get_meters(self):
         labels = self.labels['meters']
         meters = {}
-        req = Hinawa.FwReq()
-        frames = [0] * 256
-        data = req.transaction(self.unit.get_node(),
-                Hinawa.FwTcode.READ_BLOCK_REQUEST, self._ADDR_FOR_METERING,
-                self.__meters, frames)
+        data = self.unit.trx.read(self._ADDR_FOR_METERING, self.__meters,
+                                  block=True)
         for i, name in enumerate(labels):
             meters[name] = unpack('>I', data[i * 4:(i + 1) * 4])[0]
         if len(data) > len(labels) * 4:
@@ -4,10 +4,6 @@
 from struct import unpack, pack
 from pathlib import Path
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 from hinawa_utils.bebob.maudio_protocol_abstract import MaudioProtocolAbstract
 
 from hinawa_utils.ta1394.general import AvcConnection
@@ -127,15 +123,9 @@ class MaudioProtocolSpecial(MaudioProtocolAbstract):
     def __write_data(self, offset, data):
         # Write to the unit.
         count = 0
-        req = Hinawa.FwReq()
         while True:
-            if len(data) == 4:
-                tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
-            else:
-                tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
             try:
-                req.transaction(self.unit.get_node(), tcode,
-                                self.BASE_ADDR + offset, len(data), data)
+                self.unit.trx.write(self.BASE_ADDR + offset, data)
                 break
             except Exception as e:
                 if count > 10:
@@ -397,11 +387,7 @@ class MaudioProtocolSpecial(MaudioProtocolAbstract):
     # may differs analog-in and the others.
     def get_meters(self):
         meters = {}
-        req = Hinawa.FwReq()
-        data = [0] * 84
-        data = req.transaction(self.unit.get_node(),
-                               Hinawa.FwTcode.READ_BLOCK_REQUEST,
-                               self._ADDR_FOR_METERING, 84, data)
+        data = self.unit.trx.read(self._ADDR_FOR_METERING, 84)
         meters['switch-0'] = data[0]
         meters['rotery-0'] = data[1]
         meters['rotery-1'] = data[2]
@@ -11,7 +11,7 @@ __all__ = ['MaudioUnit']
 
 
 class MaudioUnit(BebobUnit):
-    __SUPPORTED_MODELS = {
+    SUPPORTED_MODELS = {
         # (VendorID, ModelID): Protocol
         (0x000d6c, 0x00000a): MaudioProtocolNormal,     # Ozonic
         (0x000d6c, 0x010062): MaudioProtocolNormal,     # Firewire Solo
@@ -23,10 +23,10 @@ class MaudioUnit(BebobUnit):
         (0x000d6c, 0x010091): MaudioProtocolSpecial,    # ProjectMix I/O
     }
 
-    def __init__(self, path):
-        super().__init__(path)
+    def __init__(self, path, info=None):
+        super().__init__(path, info)
 
         key = (self.vendor_id, self.model_id)
-        if key not in self.__SUPPORTED_MODELS:
+        if key not in self.SUPPORTED_MODELS:
             raise OSError('Not supported.')
-        self.protocol = self.__SUPPORTED_MODELS[key](self, False)
+        self.protocol = self.SUPPORTED_MODELS[key](self, False)
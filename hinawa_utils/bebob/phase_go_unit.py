@@ -10,7 +10,7 @@ __all__ = ['PhaseGoUnit']
 
 
 class PhaseGoUnit(BebobUnit):
-    _SUPPORTED_MODELS = {
+    SUPPORTED_MODELS = {
         # (VendorID, ModelID): ProtocolClass
         (0x000aac, 0x000004):   PhaseGoProtocolCoax,    # Terratec PHASE 24 FW
         (0x000aac, 0x000007):   PhaseGoProtocolOpt,     # Terratec PHASE X24 FW
@@ -18,10 +18,10 @@ class PhaseGoUnit(BebobUnit):
         (0x00a0de, 0x10000c):   PhaseGoProtocolOpt,     # Yamaha Go46
     }
 
-    def __init__(self, path):
-        super().__init__(path)
+    def __init__(self, path, info=None):
+        super().__init__(path, info)
 
         key = (self.vendor_id, self.model_id)
-        if key not in self._SUPPORTED_MODELS:
+        if key not in self.SUPPORTED_MODELS:
             raise OSError('Not supported.')
-        self.protocol = self._SUPPORTED_MODELS[key](self.fcp)
+        self.protocol = self.SUPPORTED_MODELS[key](self.fcp)
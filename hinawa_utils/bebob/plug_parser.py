@@ -13,66 +13,195 @@ from hinawa_utils.bebob.extensions import BcoStreamFormatInfo
 __all__ = ['PlugParser']
 
 
+class _LazyPlug():
+    # Each attribute of plug is retrieved by FCP transactions at first access
+    # by subscript, and cached. The attribute which the unit fails to answer
+    # is None. This is not a dictionary, thus use get_dict() to retrieve all
+    # of attributes, e.g. for serialization.
+    KEYS = ('type', 'name', 'channels', 'clusters', 'input', 'outputs')
+
+    def __init__(self, fcp, addr, direction=None):
+        # The direction is given for unit plugs. Plugs of subunits and
+        # function blocks can have counter direction.
+        self.__fcp = fcp
+        self.__addr = addr
+        self.__direction = direction
+        self.__attrs = {}
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        if key not in self.__attrs:
+            try:
+                value = getattr(self, '_fetch_' + key)()
+            except Exception:
+                value = None
+            self.__attrs[key] = value
+        return self.__attrs[key]
+
+    def fetch(self):
+        for key in self.KEYS:
+            self[key]
+        return self
+
+    def get_dict(self):
+        self.fetch()
+        return dict(self.__attrs)
+
+    def _fetch_type(self):
+        return BcoPlugInfo.get_plug_type(self.__fcp, self.__addr)
+
+    def _fetch_name(self):
+        return BcoPlugInfo.get_plug_name(self.__fcp, self.__addr)
+
+    def _fetch_channels(self):
+        channels = []
+        count = BcoPlugInfo.get_plug_channels(self.__fcp, self.__addr)
+        for channel in range(count):
+            channels.append(BcoPlugInfo.get_plug_ch_name(self.__fcp,
+                                                         self.__addr,
+                                                         channel + 1))
+        return channels
+
+    def _fetch_clusters(self):
+        clusters = []
+        if self['type'] == 'IsoStream':
+            entries = BcoPlugInfo.get_plug_clusters(self.__fcp, self.__addr)
+            for cluster in range(len(entries)):
+                clusters.append(BcoPlugInfo.get_plug_cluster_info(
+                    self.__fcp, self.__addr, cluster + 1))
+        return clusters
+
+    def _fetch_input(self):
+        if self.__direction == 'input':
+            return []
+        if self.__direction == 'output':
+            return BcoPlugInfo.get_plug_input(self.__fcp, self.__addr)
+        # Music subunits have counter direction.
+        try:
+            return BcoPlugInfo.get_plug_input(self.__fcp, self.__addr)
+        except:
+            return {}
+
+    def _fetch_outputs(self):
+        if self.__direction == 'output':
+            return []
+        if self.__direction == 'input':
+            return BcoPlugInfo.get_plug_outputs(self.__fcp, self.__addr)
+        try:
+            return BcoPlugInfo.get_plug_outputs(self.__fcp, self.__addr)
+        except:
+            return []
+
+
 class PlugParser(BebobUnit):
-    def __init__(self, path):
+    # The graph of plugs is discovered lazily. Each attribute below is
+    # retrieved at first access, and the attributes of each plug are
+    # retrieved at first access to them. Use prefetch() to retrieve them in
+    # advance:
+    #  depth 0: plugs of unit, subunits and function blocks.
+    #  depth 1: and attributes of the plugs.
+    #  depth 2: and stream formats and signal sources.
+    MAXIMUM_DEPTH = 2
+
+    def __init__(self, path, prefetch=None):
         super().__init__(path)
+        self.__cache = {}
+        self.__formats = {}
+        self.__entry_lists = {}
+        if prefetch is not None:
+            self.prefetch(prefetch)
 
-        self.unit_info = self.__parse_unit_info()
-        self.unit_plugs = self.__parse_unit_plugs()
+    def __get(self, name, func):
+        if name not in self.__cache:
+            self.__cache[name] = func()
+        return self.__cache[name]
 
-        self.subunit_plugs = self.__parse_subunit_plugs()
+    def prefetch(self, depth=MAXIMUM_DEPTH):
+        self.unit_plugs
+        self.subunit_plugs
+        self.function_block_plugs
+        if depth < 1:
+            return
 
-        self.function_block_plugs = self.__parse_function_block_plugs()
+        for plug in self.__iterate_plugs():
+            plug.fetch()
+        if depth < 2:
+            return
 
-        self.stream_formats = self.__parse_stream_formats()
+        self.stream_formats
+        self.signal_sources
 
-        self.signal_destination = self.__parse_signal_destination()
-        self.signal_sources = self.__parse_signal_sources()
+    def __iterate_plugs(self):
+        for dir_plugs in self.unit_plugs.values():
+            for plugs in dir_plugs.values():
+                yield from plugs.values()
+        for id_plugs in self.subunit_plugs.values():
+            for dir_plugs in id_plugs.values():
+                for plugs in dir_plugs.values():
+                    yield from plugs.values()
+        for id_fbs in self.function_block_plugs.values():
+            for type_fbs in id_fbs.values():
+                for fbs in type_fbs.values():
+                    for fb in fbs.values():
+                        yield from fb['inputs'].values()
+                        yield from fb['outputs'].values()
 
-    def __parse_unit_info(self):
-        return AvcGeneral.get_unit_info(self.fcp)
+    @property
+    def unit_info(self):
+        return self.__get('unit-info',
+                          lambda: AvcGeneral.get_unit_info(self.fcp))
+
+    @property
+    def unit_plug_counts(self):
+        return self.__get('unit-plug-counts',
+                          lambda: AvcConnection.get_unit_plug_info(self.fcp))
+
+    @property
+    def unit_plugs(self):
+        return self.__get('unit-plugs', self.__parse_unit_plugs)
+
+    @property
+    def subunit_plugs(self):
+        return self.__get('subunit-plugs', self.__parse_subunit_plugs)
+
+    @property
+    def function_block_plugs(self):
+        return self.__get('function-block-plugs',
+                          self.__parse_function_block_plugs)
+
+    @property
+    def stream_formats(self):
+        return self.__get('stream-formats', self.__parse_stream_formats)
+
+    @property
+    def signal_destination(self):
+        return self.__get('signal-destination',
+                          self.__parse_signal_destination)
+
+    @property
+    def signal_sources(self):
+        return self.__get('signal-sources', self.__parse_signal_sources)
 
     def __parse_unit_plugs(self):
         unit_plugs = {}
-        info = AvcConnection.get_unit_plug_info(self.fcp)
-        for type, params in info.items():
+        for type, params in self.unit_plug_counts.items():
             if type not in unit_plugs:
                 unit_plugs[type] = {}
                 unit_plugs[type]['output'] = {}
                 unit_plugs[type]['input'] = {}
             for dir, num in params.items():
                 for i in range(num + 1):
-                    try:
-                        plug = self.__parse_unit_plug(dir, type, i)
-                        unit_plugs[type][dir][i] = plug
-                    except:
+                    # The type of plug is retrieved to check its existence.
+                    plug = self.__parse_unit_plug(dir, type, i)
+                    if plug['type'] is None:
                         continue
+                    unit_plugs[type][dir][i] = plug
         return unit_plugs
 
     def __parse_unit_plug(self, dir, type, num):
-        plug = {}
         addr = BcoPlugInfo.get_unit_addr(dir, type, num)
-        plug['type'] = BcoPlugInfo.get_plug_type(self.fcp, addr)
-        plug['name'] = BcoPlugInfo.get_plug_name(self.fcp, addr)
-        plug['channels'] = []
-        channels = BcoPlugInfo.get_plug_channels(self.fcp, addr)
-        for channel in range(channels):
-            ch = BcoPlugInfo.get_plug_ch_name(self.fcp, addr, channel + 1)
-            plug['channels'].append(ch)
-        plug['clusters'] = []
-        if plug['type'] is 'IsoStream':
-            clusters = BcoPlugInfo.get_plug_clusters(self.fcp, addr)
-            for cluster in range(len(clusters)):
-                clst = BcoPlugInfo.get_plug_cluster_info(
-                    self.fcp, addr, cluster + 1)
-                plug['clusters'].append(clst)
-        plug['input'] = []
-        plug['outputs'] = []
-        if dir == 'output':
-            plug['input'] = BcoPlugInfo.get_plug_input(self.fcp, addr)
-        else:
-            plug['outputs'] = BcoPlugInfo.get_plug_outputs(self.fcp, addr)
-        return plug
+        return _LazyPlug(self.fcp, addr, dir)
 
     def __parse_subunit_plugs(self):
         subunit_plugs = {}
@@ -101,34 +230,8 @@ class PlugParser(BebobUnit):
         return subunit_plugs
 
     def __parse_subunit_plug(self, dir, type, id, num):
-        plug = {}
         addr = BcoPlugInfo.get_subunit_addr(dir, type, id, num)
-        plug['type'] = BcoPlugInfo.get_plug_type(self.fcp, addr)
-        plug['name'] = BcoPlugInfo.get_plug_name(self.fcp, addr)
-        plug['channels'] = []
-        channels = BcoPlugInfo.get_plug_channels(self.fcp, addr)
-        for channel in range(channels):
-            ch = BcoPlugInfo.get_plug_ch_name(self.fcp, addr, channel + 1)
-            plug['channels'].append(ch)
-        plug['clusters'] = []
-        if plug['type'] == 'IsoStream':
-            clusters = BcoPlugInfo.get_plug_clusters(self.fcp, addr)
-            for cluster in range(len(clusters)):
-                clst = BcoPlugInfo.get_plug_cluster_info(
-                    self.fcp, addr, cluster + 1)
-                plug['clusters'].append(clst)
-        plug['input'] = {}
-        plug['outputs'] = []
-        # Music subunits have counter direction.
-        try:
-            plug['input'] = BcoPlugInfo.get_plug_input(self.fcp, addr)
-        except:
-            pass
-        try:
-            plug['outputs'] = BcoPlugInfo.get_plug_outputs(self.fcp, addr)
-        except:
-            pass
-        return plug
+        return _LazyPlug(self.fcp, addr)
 
     def __parse_function_block_plugs(self):
         subunits = {}
@@ -174,35 +277,9 @@ class PlugParser(BebobUnit):
 
     def _parse_fb_plug(self, dir, subunit_type, subunit_id, fb_type, fb_id,
                        num):
-        plug = {}
         addr = BcoPlugInfo.get_function_block_addr(dir, subunit_type,
                                                    subunit_id, fb_type, fb_id, num)
-        plug['type'] = BcoPlugInfo.get_plug_type(self.fcp, addr)
-        plug['name'] = BcoPlugInfo.get_plug_name(self.fcp, addr)
-        plug['channels'] = []
-        channels = BcoPlugInfo.get_plug_channels(self.fcp, addr)
-        for channel in range(channels):
-            ch = BcoPlugInfo.get_plug_ch_name(self.fcp, addr, channel + 1)
-            plug['channels'].append(ch)
-        plug['clusters'] = []
-        if plug['type'] is 'IsoStream':
-            clusters = BcoPlugInfo.get_plug_clusters(self.fcp, addr)
-            for cluster in range(len(clusters)):
-                clst = BcoPlugInfo.get_plug_cluster_info(
-                    self.fcp, addr, cluster + 1)
-                plug['clusters'].append(clst)
-        plug['input'] = {}
-        plug['outputs'] = []
-        # Music subunits have counter direction.
-        try:
-            plug['input'] = BcoPlugInfo.get_plug_input(self.fcp, addr)
-        except:
-            pass
-        try:
-            plug['outputs'] = BcoPlugInfo.get_plug_outputs(self.fcp, addr)
-        except:
-            pass
-        return plug
+        return _LazyPlug(self.fcp, addr)
 
     def __parse_signal_destination(self):
         dst = []
@@ -244,6 +321,16 @@ class PlugParser(BebobUnit):
             srcs.append(params)
         return srcs
 
+    def get_stream_formats(self, addr):
+        # The list is cached for each address, and identical formats are
+        # parsed once between plugs. Callers get copies of them.
+        key = bytes(addr)
+        if key not in self.__entry_lists:
+            self.__entry_lists[key] = BcoStreamFormatInfo.get_entry_list(
+                self.fcp, addr, self.__formats)
+        return [BcoStreamFormatInfo.copy_format(fmt)
+                for fmt in self.__entry_lists[key]]
+
     def __parse_stream_formats(self):
         hoge = {}
         for type, dir_plugs in self.unit_plugs.items():
@@ -255,9 +342,8 @@ class PlugParser(BebobUnit):
                 for i, plug in plugs.items():
                     addr = BcoPlugInfo.get_unit_addr(dir, type, i)
                     try:
-                        fmts = BcoStreamFormatInfo.get_entry_list(self.fcp,
-                                                                  addr)
-                        hoge[type][dir][i] = fmts
-                    except:
+                        fmts = self.get_stream_formats(addr)
+                    except (OSError, RuntimeError):
                         continue
+                    hoge[type][dir][i] = fmts
         return hoge
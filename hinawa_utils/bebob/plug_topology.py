@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+from hinawa_utils.misc.json_codec import encode_value, decode_value
+from hinawa_utils.misc.json_codec import dump_atomically
+
+__all__ = ['PlugTopology']
+
+
+class PlugTopology():
+    # The structure of plugs is fixed for firmware, thus it is cached in JSON
+    # file for the fingerprint of firmware. Units with the same firmware
+    # share the file. The definite answers of inquiry about connection between
+    # plugs are also fixed for firmware, thus kept in the file, keyed by the
+    # pair of addresses of source and destination.
+    VERSION = 2
+
+    def __init__(self, fingerprint, unit_plugs, subunit_plugs, specs,
+                 connections=None):
+        self.fingerprint = fingerprint
+        self.unit_plugs = unit_plugs
+        self.subunit_plugs = subunit_plugs
+        self.specs = specs
+        if connections is None:
+            connections = {}
+        self.connections = connections
+        self.path = None
+
+    @staticmethod
+    def get_cache_dir():
+        cache_dir = os.environ.get('XDG_CACHE_HOME')
+        if not cache_dir:
+            cache_dir = Path(Path.home(), '.cache')
+        return Path(cache_dir, 'hinawa-utils', 'bebob-topology')
+
+    @staticmethod
+    def compute_fingerprint(vendor_id, model_id, firmware_info):
+        software = firmware_info['software']
+        literal = json.dumps({
+            'vendor-id':    vendor_id,
+            'model-id':     model_id,
+            'build-date':   software['build-date'],
+            'build-time':   software['build-time'],
+            'id':           software['id'],
+            'version':      software['version'],
+        }, sort_keys=True)
+        return hashlib.sha1(literal.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def discover(cls, unit, fingerprint=None):
+        unit_plugs = unit.get_unit_plug_list()
+        subunit_plugs = unit.get_subunit_plug_list()
+        specs = {}
+        for plugs in (unit_plugs, subunit_plugs):
+            for seqid, info in plugs.items():
+                specs[seqid] = unit.get_plug_spec(info)
+        return cls(fingerprint, unit_plugs, subunit_plugs, specs)
+
+    @classmethod
+    def from_unit(cls, unit, cache_dir=None):
+        # The information of firmware is read again so that the fingerprint
+        # reflects firmware updated after the unit is opened.
+        firmware_info = unit.get_firmware_info().get_dict()
+        fingerprint = cls.compute_fingerprint(unit.vendor_id, unit.model_id,
+                                              firmware_info)
+        if cache_dir is None:
+            cache_dir = cls.get_cache_dir()
+        path = Path(cache_dir, '{0}.json'.format(fingerprint))
+
+        try:
+            topology = cls.load(path)
+            if topology.fingerprint == fingerprint:
+                topology.path = path
+                return topology
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        topology = cls.discover(unit, fingerprint)
+        topology.path = path
+        topology.store()
+        return topology
+
+    @classmethod
+    def load(cls, path):
+        with Path(path).open(mode='r') as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ValueError('Unsupported version of topology: {0}'.format(
+                path))
+        return cls(data['fingerprint'],
+                   decode_value(data['unit-plugs']),
+                   decode_value(data['subunit-plugs']),
+                   decode_value(data['specs']),
+                   decode_value(data['connections']))
+
+    def save(self, path):
+        data = {
+            'version':          self.VERSION,
+            'fingerprint':      self.fingerprint,
+            'unit-plugs':       encode_value(self.unit_plugs),
+            'subunit-plugs':    encode_value(self.subunit_plugs),
+            'specs':            encode_value(self.specs),
+            'connections':      encode_value(self.connections),
+        }
+        dump_atomically(path, data, sort_keys=True)
+
+    def store(self):
+        # Save into the cache file, if the topology is for it.
+        if self.path is None:
+            return
+        try:
+            self.save(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def get_plug_key(info):
+        # Sequential IDs of plugs depend on the number of plugs, thus plugs
+        # are identified by their address for comparison.
+        data = info['data']
+        if info['mode'] == 'unit':
+            return 'unit {0} {1} {2}'.format(data['unit-type'], info['dir'],
+                                             data['plug'])
+        return 'subunit {0} {1} {2} {3}'.format(data['subunit-type'],
+                                                data['subunit-id'],
+                                                info['dir'], data['plug'])
+
+    def get_plugs(self):
+        plugs = {}
+        for plug_list in (self.unit_plugs, self.subunit_plugs):
+            for seqid, info in plug_list.items():
+                plugs[self.get_plug_key(info)] = self.specs.get(seqid)
+        return plugs
+
+    @classmethod
+    def diff(cls, old, new):
+        # The list of tuples with kind of change, key of plug, old spec and
+        # new spec is returned.
+        old_plugs = old.get_plugs()
+        new_plugs = new.get_plugs()
+        changes = []
+        for key in sorted(set(old_plugs) | set(new_plugs)):
+            if key not in new_plugs:
+                changes.append(('removed', key, old_plugs[key], None))
+            elif key not in old_plugs:
+                changes.append(('added', key, None, new_plugs[key]))
+            elif old_plugs[key] != new_plugs[key]:
+                changes.append(('changed', key, old_plugs[key],
+                                new_plugs[key]))
+        return changes
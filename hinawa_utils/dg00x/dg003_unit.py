@@ -48,9 +48,13 @@ class Dg003Unit(Dg00xUnit):
         if src not in labels:
             raise ValueError('Invalid argument for source of mixer.')
 
+        offsets = []
         for offset in (0x08 * ch, 0x08 * ch + 0x04):
             offset += self.__OFFSET_MIXER_SRC + labels.index(src) * 0x10
-            data = self._read_transaction(offset, 4)
+            offsets.append(offset)
+
+        frames = self._read_transactions([(offset, 4) for offset in offsets])
+        for offset, data in zip(offsets, frames):
             pair.append([offset, unpack('>I', data)[0]])
 
         return pair
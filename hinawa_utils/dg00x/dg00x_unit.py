@@ -1,12 +1,12 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
-
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
+from hinawa_utils.misc.transaction_engine import TransactionEngine
 
 from hinawa_utils.dg00x.config_rom_parser import Dg00xConfigRomParser
 
@@ -20,34 +20,23 @@ class Dg00xUnit(Hinawa.SndDg00x):
     SUPPORTED_CLOCK_SOURCES = ('Internal', 'S/PDIF', 'ADAT', 'Word-clock')
     SUPPORTED_OPTICAL_INTERFACES = ('ADAT', 'S/PDIF')
 
-    def __init__(self, path):
+    def __init__(self, path, info=None):
         super().__init__()
         self.open(path)
         if self.get_property('type') != 5:
             raise ValueError('The character device is not for Dg00x unit')
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
-
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
-
-        parser = Dg00xConfigRomParser()
-        info = parser.parse_rom(self.get_node().get_config_rom())
+        self.__dispatcher = UnitDispatcher(self)
+
+        self.trx = TransactionEngine(self.get_node())
+
+        if info is None:
+            info = Dg00xConfigRomParser().parse_rom(
+                self.get_node().get_config_rom())
         self._model_name = info['model-name']
 
     def release(self):
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
 
     def __enter__(self):
         return self
@@ -56,24 +45,14 @@ class Dg00xUnit(Hinawa.SndDg00x):
         self.release()
 
     def _read_transaction(self, offset, size):
-        req = Hinawa.FwReq()
-        addr = self.__BASE_ADDR + offset
-        if size == 4:
-            tcode = Hinawa.FwTcode.READ_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.READ_BLOCK_REQUEST
-        frames = bytearray(size)
-        return req.transaction(self.get_node(), tcode, addr, size, frames)
-
-    def _write_transaction(self, offset, size):
-        req = Hinawa.FwReq()
-        addr = self.__BASE_ADDR + offset
-        if size == 4:
-            tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
-        frames = bytearray(size)
-        return req.transaction(self.get_node(), tcode, addr, size, frames)
+        return self.trx.read(self.__BASE_ADDR + offset, size)
+
+    def _read_transactions(self, ranges, gap=0):
+        ranges = [(self.__BASE_ADDR + offset, size) for offset, size in ranges]
+        return self.trx.read_batch(ranges, gap)
+
+    def _write_transaction(self, offset, data):
+        self.trx.write(self.__BASE_ADDR + offset, data)
 
     def set_clock_source(self, source):
         if source not in self.SUPPORTED_CLOCK_SOURCES:
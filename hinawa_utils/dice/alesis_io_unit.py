@@ -3,10 +3,6 @@
 
 from struct import pack, unpack
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 from hinawa_utils.dice.dice_unit import DiceUnit
 
 __all__ = ['AlesisIoUnit']
@@ -124,12 +120,12 @@ class AlesisIoUnit(DiceUnit):
             self.__write_data(self.__MIXER_23_24_SWITCH, data)
 
     def __write_data(self, offset, data):
-        req = Hinawa.FwReq()
+        req = self.trx
         offset += self.__BASE_OFFSET
         self._protocol.write_transactions(req, offset, data)
 
     def __read_data(self, offset, length):
-        req = Hinawa.FwReq()
+        req = self.trx
         offset += self.__BASE_OFFSET
         return self._protocol.read_transactions(req, offset, length)
 
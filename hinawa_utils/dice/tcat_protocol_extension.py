@@ -42,7 +42,13 @@ class ExtCtlSpace():
         return protocol.read_transactions(req, offset, length)
 
     @classmethod
-    def detect_layout(cls, protocol, req):
+    def detect_layout(cls, protocol, req, cache=None):
+        if cache is not None:
+            layout = cache.get('tcat-extension-layout')
+            if layout is not None:
+                protocol._ext_layout = layout
+                return layout
+
         layout = {}
 
         data = protocol.read_transactions(req, cls._EXT_OFFSET,
@@ -54,6 +60,8 @@ class ExtCtlSpace():
             }
 
         protocol._ext_layout = layout
+        if cache is not None:
+            cache.set('tcat-extension-layout', layout)
         return layout
 
 # '3.2 Capability space'
@@ -117,7 +125,13 @@ class ExtCapsSpace():
         return caps
 
     @classmethod
-    def detect_caps(cls, protocol, req):
+    def detect_caps(cls, protocol, req, cache=None):
+        if cache is not None:
+            caps = cache.get('tcat-extension-caps')
+            if caps is not None:
+                protocol._ext_caps = caps
+                return caps
+
         caps = {}
 
         length = protocol._ext_layout['caps']['length']
@@ -129,6 +143,8 @@ class ExtCapsSpace():
         caps['reserved'] = data[cls._OFFSET_RESERVED_CAPS:]
 
         protocol._ext_caps = caps
+        if cache is not None:
+            cache.set('tcat-extension-caps', caps)
 
         return caps
 
@@ -3,10 +3,6 @@
 
 from struct import unpack
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 __all__ = ['TcatProtocolGeneral']
 
 
@@ -46,10 +42,35 @@ class TcatProtocolGeneral():
     def __init__(self, unit, req):
         self._unit = unit
 
+        # The layout and version are read at each open to identify firmware.
         self._general_layout = self._detect_address_space(req)
         self._version = self._parse_dice_version(req)
+
+    def get_firmware_key(self):
+        return {
+            'layout':   self._general_layout,
+            'version':  self._version,
+        }
+
+    def probe_general(self, req, cache=None):
+        # The labels and capabilities are static for each firmware.
+        if cache is not None:
+            general = cache.probe('tcat-general',
+                                  lambda: self._probe_general(req))
+            self._clock_source_labels = general['clock-source-labels']
+            self._sampling_rates = general['sampling-rates']
+            self._clock_sources = general['clock-sources']
+        else:
+            self._probe_general(req)
+
+    def _probe_general(self, req):
         self._clock_source_labels = self._parse_clock_source_names(req)
         self._sampling_rates, self._clock_sources = self._parse_clock_caps(req)
+        return {
+            'clock-source-labels':  self._clock_source_labels,
+            'sampling-rates':       self._sampling_rates,
+            'clock-sources':        self._clock_sources,
+        }
 
     def write_transactions(self, req, offset, data):
         addr = self._BASE_ADDR + offset
@@ -60,12 +81,7 @@ class TcatProtocolGeneral():
             count = length
             if count > self._MAXIMUM_TRX_LENGTH:
                 count = self._MAXIMUM_TRX_LENGTH
-            if count == 4:
-                tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
-            else:
-                tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
-            req.transaction(self._unit.get_node(), tcode, addr, count,
-                            data[0:count])
+            req.write(addr, data[0:count])
             data = data[count:]
             length -= count
             addr += count
@@ -79,13 +95,7 @@ class TcatProtocolGeneral():
             count = length
             if count > self._MAXIMUM_TRX_LENGTH:
                 count = self._MAXIMUM_TRX_LENGTH
-            if count == 4:
-                tcode = Hinawa.FwTcode.READ_QUADLET_REQUEST
-            else:
-                tcode = Hinawa.FwTcode.READ_BLOCK_REQUEST
-            frames = bytearray(count)
-            frames = req.transaction(self._unit.get_node(), tcode, addr, count,
-                                     frames)
+            frames = req.read(addr, count)
             data.extend(frames)
             length -= count
             addr += count
@@ -1,12 +1,11 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
-
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
 
 from hinawa_utils.efw.transactions import EftInfo
 from hinawa_utils.efw.transactions import EftHwctl
@@ -25,27 +24,15 @@ class EfwUnit(Hinawa.SndEfw):
         super().__init__()
         self.open(path)
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
-
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
+        self.__dispatcher = UnitDispatcher(self)
 
+        # The response includes the versions of firmware, thus it is not
+        # cached; the cache is not validated without the same transaction.
         self.info = EftInfo.get_spec(self)
         self._fixup_info()
 
     def release(self):
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
 
     def __enter__(self):
         return self
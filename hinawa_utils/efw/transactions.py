@@ -7,11 +7,24 @@ from gi.repository import Hinawa
 
 from array import array
 from math import log10
+from time import perf_counter
 
 __all__ = ['EftInfo', 'EftFlash', 'EftTransmit', 'EftHwctl', 'EftPhysOutput',
            'EftPhysInput', 'EftPlayback', 'EftCapture', 'EftMonitor',
            'EftIoconf']
 
+
+def _transaction(unit, category, cmd, args):
+    params = [0] * 256
+    profiler = getattr(unit, 'profiler', None)
+    if profiler is None:
+        return unit.transaction(category, cmd, args, params)
+    begin = perf_counter()
+    params = unit.transaction(category, cmd, args, params)
+    length = len(args) * 4 if args else 0
+    profiler.record_efw(category, cmd, length, perf_counter() - begin)
+    return params
+
 #
 # Category No.0, for hardware information
 #
@@ -86,7 +99,7 @@ class EftInfo():
         'guitar string'
     )
 
-    __MODELS = {
+    MODELS = {
         'Audiofire2':           0x000af2,
         'Audiofire4':           0x000af4,
         'Audiofire8':           0x000af8,
@@ -148,14 +161,13 @@ class EftInfo():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(0, cmd, args, params)
+        return _transaction(unit, 0, cmd, args)
 
     @classmethod
     def get_spec(cls, unit):
         params = cls._execute_command(unit, 0, None)
         info = {}
-        for model, value in cls.__MODELS.items():
+        for model, value in cls.MODELS.items():
             if value == params[3]:
                 info['model'] = model
                 break
@@ -337,8 +349,7 @@ class EftFlash():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(1, cmd, args, params)
+        return _transaction(unit, 1, cmd, args)
 
     @classmethod
     def erase(cls, unit, offset):
@@ -402,8 +413,7 @@ class EftTransmit():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(2, cmd, args, params)
+        return _transaction(unit, 2, cmd, args)
 
     @classmethod
     def set_mode(cls, unit, mode):
@@ -474,8 +484,7 @@ class EftHwctl():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(3, cmd, args, params)
+        return _transaction(unit, 3, cmd, args)
 
     @classmethod
     def set_clock(cls, unit, rate, source, reset):
@@ -552,8 +561,7 @@ class EftPhysOutput():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(4, cmd, args, params)
+        return _transaction(unit, 4, cmd, args)
 
     @classmethod
     def set_param(cls, unit, operation, channel, value):
@@ -605,8 +613,7 @@ class EftPhysInput():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(5, cmd, args, params)
+        return _transaction(unit, 5, cmd, args)
 
     @classmethod
     def set_param(cls, unit, operation, channel, value):
@@ -646,8 +653,7 @@ class EftPlayback():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(6, cmd, args, params)
+        return _transaction(unit, 6, cmd, args)
 
     @classmethod
     def set_param(cls, unit, operation, channel, value):
@@ -691,8 +697,7 @@ class EftCapture():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(7, cmd, args, params)
+        return _transaction(unit, 7, cmd, args)
 
 #
 # Category No.8, for input monitoring multiplexer commands
@@ -706,8 +711,7 @@ class EftMonitor():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(8, cmd, args, params)
+        return _transaction(unit, 8, cmd, args)
 
     @classmethod
     def set_param(cls, unit, operation, in_ch, out_ch, value):
@@ -764,8 +768,7 @@ class EftIoconf():
     def _execute_command(unit, cmd, args):
         if not isinstance(unit, Hinawa.SndEfw):
             raise ValueError('Invalid argument for SndEfw')
-        params = [0] * 256
-        return unit.transaction(9, cmd, args, params)
+        return _transaction(unit, 9, cmd, args)
 
     @classmethod
     def set_control_room_mirroring(cls, unit, output_pair):
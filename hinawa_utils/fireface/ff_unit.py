@@ -1,15 +1,16 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
 from math import log10
 from struct import pack, unpack
 from pathlib import Path
 
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
+from hinawa_utils.misc.transaction_engine import TransactionEngine
 
 from hinawa_utils.fireface.ff_config_rom_parser import FFConfigRomParser
 from hinawa_utils.fireface.ff_option_reg import FFOptionReg
@@ -21,7 +22,7 @@ __all__ = ['FFUnit']
 
 
 class FFUnit(Hinawa.SndUnit):
-    __MODELS = {
+    MODELS = {
         0x000001:   'Fireface800',
         0x000002:   'Fireface400',
     }
@@ -52,29 +53,21 @@ class FFUnit(Hinawa.SndUnit):
     __MIN_VAL = 0x00000001
     __MAX_VAL = 0x00010000
 
-    def __init__(self, path):
+    def __init__(self, path, info=None):
         super().__init__()
         self.open(path)
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
-
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
-
-        parser = FFConfigRomParser()
-        info = parser.parse_rom(self.get_node().get_config_rom())
-        if info['model_id'] not in self.__MODELS:
+        self.__dispatcher = UnitDispatcher(self)
+
+        self.trx = TransactionEngine(self.get_node())
+
+        if info is None:
+            info = FFConfigRomParser().parse_rom(
+                self.get_node().get_config_rom())
+        if info['model_id'] not in self.MODELS:
             raise OSError('Unsupported model.')
 
-        self.__name = self.__MODELS[info['model_id']]
+        self.__name = self.MODELS[info['model_id']]
         self.__regs = self.__REGS[info['model_id']]
         self.__spec = self.__SPECS[info['model_id']]
 
@@ -93,10 +86,7 @@ class FFUnit(Hinawa.SndUnit):
         self.__load_option_settings()
 
     def release(self):
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
 
     def __enter__(self):
         return self
@@ -157,10 +147,8 @@ class FFUnit(Hinawa.SndUnit):
         if self.__name == 'Fireface400':
             FFOptionReg.build_single_option(self.__option_cache,
                                             'midi-low-addr', '0x00000000', True)
-        req = Hinawa.FwReq()
         frames = pack('<3I', *self.__option_cache)
-        req.transaction(self.get_node(), Hinawa.FwTcode.WRITE_BLOCK_REQUEST,
-                        self.__regs[0], len(frames), frames)
+        self.trx.write(self.__regs[0], frames)
 
     def __create_multiple_option_initial_cache(self, cache):
         default_params = {
@@ -243,11 +231,7 @@ class FFUnit(Hinawa.SndUnit):
                                                item)
 
     def get_sync_status(self):
-        req = Hinawa.FwReq()
-        frames = bytearray(8)
-        frames = req.transaction(self.get_node(),
-                    Hinawa.FwTcode.READ_BLOCK_REQUEST,
-                    0x0000801c0000, 8, frames)
+        frames = self.trx.read(0x0000801c0000, 8)
         quads = unpack('<2I', frames)
 
         return FFStatusReg.parse(quads)
@@ -290,9 +274,7 @@ class FFUnit(Hinawa.SndUnit):
         offset = FFMixerRegs.calculate_src_offset(self.__spec, target, src)
         val = self.__build_val_from_db(db)
         data = pack('<I', val)
-        req = Hinawa.FwReq()
-        req.transaction(self.get_node(), Hinawa.FwTcode.WRITE_BLOCK_REQUEST,
-                        self.__regs[1] + offset, len(data), data)
+        self.trx.write(self.__regs[1] + offset, data, block=True)
         self.__mixer_cache[offset // 4] = val
         self.__write_cache_to_file()
 
@@ -320,9 +302,7 @@ class FFUnit(Hinawa.SndUnit):
         offset = FFOutRegs.calculate_out_offset(self.__spec, target)
         val = self.__build_val_from_db(db)
         data = pack('<I', val)
-        req = Hinawa.FwReq()
-        req.transaction(self.get_node(), Hinawa.FwTcode.WRITE_BLOCK_REQUEST,
-                        self.__regs[2] + offset, len(data), data)
+        self.trx.write(self.__regs[2] + offset, data, block=True)
         self.__out_cache[offset // 4] = val
 
     def get_out_volume(self, target):
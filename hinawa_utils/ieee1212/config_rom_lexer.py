@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from struct import unpack
+from struct import unpack_from
 from enum import Enum
 
 __all__ = ['Ieee1212ConfigRomLexer']
@@ -21,87 +21,197 @@ class EntryType(Enum):
         return "'" + self.name + "'"
 
 
+# Lookup table for the two bits of entry type.
+_ENTRY_TYPES = tuple(EntryType(i) for i in range(4))
+
+
+def _generate_crc16_table():
+    # CRC-16 in ITU-T recommendation, with polynomial 0x1021.
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for j in range(8):
+            if crc & 0x8000:
+                crc = (crc << 1) ^ 0x1021
+            else:
+                crc <<= 1
+        table.append(crc & 0xffff)
+    return tuple(table)
+
+
+class _CrcChecker():
+    __TABLE = _generate_crc16_table()
+
+    def __init__(self, strict):
+        self.strict = strict
+        self.results = []
+
+    @classmethod
+    def compute(cls, view, offset, length):
+        crc = 0
+        for octet in view[offset:offset + length]:
+            crc = ((crc << 8) & 0xffff) ^ cls.__TABLE[(crc >> 8) ^ octet]
+        return crc
+
+    def check(self, block, view, offset, quadlet_count, crc):
+        # The CRC covers the quadlets following to the header quadlet.
+        length = quadlet_count * 4
+        computed = self.compute(view, offset + 4, length)
+        result = {
+            'block':    block,
+            'offset':   offset,
+            'expected': crc,
+            'computed': computed,
+            'valid':    computed == crc and offset + 4 + length <= len(view),
+        }
+        self.results.append(result)
+        if self.strict and not result['valid']:
+            msg = 'CRC mismatch in {0} at 0x{1:04x}: 0x{2:04x} != 0x{3:04x}'
+            raise ValueError(msg.format(block, offset, crc, computed))
+
+
+class _LexerContext():
+    # Blocks are memoized by their offsets since they can be referred from
+    # several entries. The offsets of directories under lexing are kept to
+    # detect cycles.
+    MAXIMUM_DEPTH = 16
+
+    def __init__(self, view, checker, handles):
+        self.view = view
+        self.checker = checker
+        self.handles = handles
+        self.leaves = {}
+        self.directories = {}
+        self.stack = []
+
+    def check_header(self, offset):
+        if offset < 0 or offset + 4 > len(self.view):
+            raise ValueError('Offset 0x{0:x} is out of range.'.format(offset))
+
+    def clamp_length(self, offset, length):
+        # Some units have blocks of which length exceeds the image.
+        available = (len(self.view) - offset - 4) & ~0x03
+        return min(length, available)
+
+
 class Ieee1212ConfigRomLexer():
+    # The lexer works with offsets on one memoryview so that each quadlet is
+    # read just once.
+    #
+    # When verify or strict is enabled, CRC-16 of bus information block, each
+    # leaf and each directory is verified and the results are added to the
+    # entries with 'crc' key. In strict mode, ValueError is raised at the first
+    # mismatch.
     @classmethod
-    def detect_entries(cls, data):
+    def detect_entries(cls, data, verify=False, strict=False):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        view = memoryview(data)
+
+        checker = None
+        if verify or strict:
+            checker = _CrcChecker(strict)
+        #
+        # Table 7 - Directory entry types
+        #
+        handles = (
+            cls._detect_immediate,
+            cls._detect_csr_offset,
+            cls._detect_leaf,
+            cls._detect_directory,
+        )
+        ctx = _LexerContext(view, checker, handles)
+
         entries = {}
 
-        bus_info_length = cls._detect_bus_info_length(data)
-        entries['bus-info'] = data[4:4 + bus_info_length]
-        data = data[4 + bus_info_length:]
+        bus_info_length = cls._detect_bus_info_length(ctx, 0)
+        entries['bus-info'] = view[4:4 + bus_info_length].tobytes()
 
-        entries['root-directory'] = cls._detect_directory_entries(data)
+        offset = 4 + bus_info_length
+        entries['root-directory'] = cls._detect_directory_entries(ctx, offset)
+
+        if checker is not None:
+            entries['crc'] = checker.results
 
         return entries
 
     @classmethod
-    def _detect_bus_info_length(cls, data):
-        bus_info_quadlet_count = data[0]
-        crc_quadlet_count = data[1]
-        crc = unpack('>H', data[2:4])[0]
-        return bus_info_quadlet_count * 4
+    def _detect_bus_info_length(cls, ctx, offset):
+        ctx.check_header(offset)
+        bus_info_quadlet_count, crc_quadlet_count, crc = \
+            unpack_from('>BBH', ctx.view, offset)
+        if ctx.checker is not None:
+            ctx.checker.check('bus-info', ctx.view, offset, crc_quadlet_count,
+                              crc)
+        return ctx.clamp_length(offset, bus_info_quadlet_count * 4)
 
     @classmethod
-    def _detect_leaf_length(cls, data):
-        quadlet_count = unpack('>H', data[0:2])[0]
-        crc = unpack('>H', data[2:4])[0]
-        return quadlet_count * 4
+    def _detect_leaf_length(cls, ctx, offset):
+        ctx.check_header(offset)
+        quadlet_count, crc = unpack_from('>HH', ctx.view, offset)
+        if ctx.checker is not None:
+            ctx.checker.check('leaf', ctx.view, offset, quadlet_count, crc)
+        return ctx.clamp_length(offset, quadlet_count * 4)
 
     @classmethod
-    def _detect_directory_length(cls, data):
-        quadlet_count = unpack('>H', data[0:2])[0]
-        crc = unpack('>H', data[2:4])[0]
-        return quadlet_count * 4
+    def _detect_directory_length(cls, ctx, offset):
+        ctx.check_header(offset)
+        quadlet_count, crc = unpack_from('>HH', ctx.view, offset)
+        if ctx.checker is not None:
+            ctx.checker.check('directory', ctx.view, offset, quadlet_count,
+                              crc)
+        return ctx.clamp_length(offset, quadlet_count * 4)
 
     @classmethod
-    def _detect_immediate(cls, key, value, data):
+    def _detect_immediate(cls, key, value, ctx, offset):
         return value
 
     @classmethod
-    def _detect_csr_offset(cls, key, value, data):
+    def _detect_csr_offset(cls, key, value, ctx, offset):
         return 0xfffff0000000 + value * 4
 
     @classmethod
-    def _detect_leaf(cls, key, value, data):
-        offset = value * 4
-        data = data[offset:]
-        length = cls._detect_leaf_length(data)
-        return data[4:4 + length]
+    def _detect_leaf(cls, key, value, ctx, offset):
+        offset += value * 4
+        if offset not in ctx.leaves:
+            length = cls._detect_leaf_length(ctx, offset)
+            ctx.leaves[offset] = ctx.view[offset + 4:offset + 4 + length] \
+                .tobytes()
+        return ctx.leaves[offset]
 
     @classmethod
-    def _detect_directory(cls, key, value, data):
-        data = data[value * 4:]
-        return cls._detect_directory_entries(data)
+    def _detect_directory(cls, key, value, ctx, offset):
+        return cls._detect_directory_entries(ctx, offset + value * 4)
 
     @classmethod
-    def _detect_directory_entries(cls, data):
-        #
-        # Table 7 - Directory entry types
-        #
-        TYPE_HANDLES = {
-            EntryType.IMMEDIATE:   cls._detect_immediate,
-            EntryType.CSR_OFFSET:  cls._detect_csr_offset,
-            EntryType.LEAF:        cls._detect_leaf,
-            EntryType.DIRECTORY:   cls._detect_directory,
-        }
+    def _detect_directory_entries(cls, ctx, offset):
+        if offset in ctx.directories:
+            return ctx.directories[offset]
+        if offset in ctx.stack:
+            raise ValueError(
+                'Directory at 0x{0:x} refers to itself.'.format(offset))
+        if len(ctx.stack) >= ctx.MAXIMUM_DEPTH:
+            raise ValueError('Directories are nested too deeply.')
+
         entries = []
 
-        length = cls._detect_directory_length(data)
-        data = data[4:]
+        ctx.stack.append(offset)
+        base = offset
 
-        while length > 0:
-            type_id = data[0] >> 6
-            key_id = data[0] & 0x3f
-            value = (data[1] << 16) | (data[2] << 8) | data[3]
+        length = cls._detect_directory_length(ctx, offset)
+        offset += 4
 
-            if not EntryType.check_value(type_id):
-                raise ValueError('Type {0} is not defined.'.format(type_id))
-            type = EntryType(type_id)
+        for offset in range(offset, offset + length, 4):
+            quadlet = unpack_from('>I', ctx.view, offset)[0]
+            type_id = quadlet >> 30
+            key_id = (quadlet >> 24) & 0x3f
+            value = quadlet & 0x00ffffff
 
-            entry = [(key_id, type), TYPE_HANDLES[type](key_id, value, data)]
+            entry = [(key_id, _ENTRY_TYPES[type_id]),
+                     ctx.handles[type_id](key_id, value, ctx, offset)]
             entries.append(entry)
 
-            data = data[4:]
-            length -= 4
+        ctx.stack.pop()
+        ctx.directories[base] = entries
 
         return entries
@@ -55,6 +55,21 @@ class KeyType(Enum):
         return value in (item.value for item in cls)
 
 
+# Lookup table for key ID.
+_KEY_TYPES = {item.value: item for item in KeyType}
+
+
+def _compile_keys(defined_keys, common_keys=None):
+    # The pair of key ID and entry type is what lexer yields for each entry.
+    keys = {}
+    if common_keys:
+        keys.update(common_keys)
+    keys.update(defined_keys)
+    return frozenset((key_type.value, entry_type)
+                     for key_type, entry_types in keys.items()
+                     for entry_type in entry_types)
+
+
 class Ieee1212RootDirectoryParser():
     #
     # Table 16 - Key definitions
@@ -92,32 +107,76 @@ class Ieee1212RootDirectoryParser():
         # 0x30-37: by bus standard.
     }
 
+    _COMPILED_COMMON_KEYS = _compile_keys(_COMMON_KEYS)
+
     def __init__(self):
         self._bus_dep_handles = {}
         self._spec_dep_handles = {}
         self._vendor_dep_handles = {}
         self._keyword_dep_handles = {}
+        # Compiled from the above at first parse after registration.
+        self.__dispatch_table = None
+
+        self.__type_parsers = {
+            EntryType.IMMEDIATE:    self.__parse_immediate,
+            EntryType.CSR_OFFSET:   lambda key_type, ctx, data: data,
+            EntryType.LEAF:         self._parse_leaf,
+            EntryType.DIRECTORY:    self._parse_directory,
+        }
+        self.__leaf_parsers = {
+            KeyType.DESCRIPTOR:         self._parse_descriptor_leaf,
+            KeyType.BUS_DEPENDENT_INFO: self._parse_bus_dependent_info_leaf,
+            KeyType.VENDOR:             self._parse_vendor_leaf,
+            KeyType.MODULE:             self._parse_eui_64_leaf,
+            KeyType.EUI_64:             self._parse_eui_64_leaf,
+            KeyType.DEPENDENT_INFO:     self._parse_dependent_info_leaf,
+            KeyType.UNIT_LOCATION:      self._parse_unit_location_leaf,
+            KeyType.KEYWORD:            self._parse_keyword_leaf,
+            KeyType.MODIFIABLE_DESCRIPTOR: self._parse_modifiable_desc_leaf,
+        }
+        self.__directory_parsers = {
+            KeyType.DESCRIPTOR:         self._parse_descriptor_directory,
+            KeyType.BUS_DEPENDENT_INFO: self._parse_bus_dependent_directory,
+            KeyType.VENDOR:             self._parse_vendor_directory,
+            KeyType.MODULE:             self._parse_module_directory,
+            KeyType.FEATURE:            self._parse_feature_directory,
+            KeyType.UNIT:               self._parse_unit_directory,
+            KeyType.DEPENDENT_INFO:     self._parse_dependent_info_directory,
+            KeyType.INSTANCE:           self._parse_instance_directory,
+        }
+
+    def __add_handle(self, handles, key, handle):
+        if key not in handles:
+            handles[key] = []
+        handles[key].append(handle)
+        self.__dispatch_table = None
 
     def add_bus_dep_handle(self, name, handle):
-        if name not in self._bus_dep_handles:
-            self._bus_dep_handles[name] = []
-        self._bus_dep_handles[name].append(handle)
+        self.__add_handle(self._bus_dep_handles, name, handle)
 
     def add_spec_dep_handle(self, spec_id, version, handle):
         specifier = (spec_id, version)
-        if specifier not in self._spec_dep_handles:
-            self._spec_dep_handles[specifier] = []
-        self._spec_dep_handles[specifier].append(handle)
+        self.__add_handle(self._spec_dep_handles, specifier, handle)
 
     def add_vendor_dep_handle(self, vendor_id, handle):
-        if vendor_id not in self._vendor_dep_handles:
-            self._vendor_dep_handles[vendor_id] = []
-        self._vendor_dep_handles[vendor_id].append(handle)
+        self.__add_handle(self._vendor_dep_handles, vendor_id, handle)
 
     def add_keyword_dep_handle(self, keyword, handle):
-        if keyword not in self._keyword_dep_handles:
-            self._keyword_dep_handles[keyword] = []
-        self._keyword_dep_handles[keyword].append(handle)
+        self.__add_handle(self._keyword_dep_handles, keyword, handle)
+
+    def __compile_dispatch_table(self):
+        # Flatten handles into one table keyed by directory context.
+        EXTERNAL_HANDLES = {
+            DirectoryContext.VENDOR:        self._vendor_dep_handles,
+            DirectoryContext.SPECIFIER:     self._spec_dep_handles,
+            DirectoryContext.BUS_DEPENDENT: self._bus_dep_handles,
+            DirectoryContext.KEYWORD:       self._keyword_dep_handles,
+        }
+        table = {}
+        for ctx_name, handles in EXTERNAL_HANDLES.items():
+            for ctx_value, entries in handles.items():
+                table[(ctx_name, ctx_value)] = tuple(entries)
+        return table
 
     def __parse_immediate(self, key_type, ctx, value):
         #
@@ -267,57 +326,40 @@ class Ieee1212RootDirectoryParser():
         return info
 
     def _parse_leaf(self, key_type, ctx, data):
-        LEAF_PARSERS = {
-            KeyType.DESCRIPTOR:         self._parse_descriptor_leaf,
-            KeyType.BUS_DEPENDENT_INFO: self._parse_bus_dependent_info_leaf,
-            KeyType.VENDOR:             self._parse_vendor_leaf,
-            KeyType.MODULE:             self._parse_eui_64_leaf,
-            KeyType.EUI_64:             self._parse_eui_64_leaf,
-            KeyType.DEPENDENT_INFO:     self._parse_dependent_info_leaf,
-            KeyType.UNIT_LOCATION:      self._parse_unit_location_leaf,
-            KeyType.KEYWORD:            self._parse_keyword_leaf,
-            KeyType.MODIFIABLE_DESCRIPTOR: self._parse_modifiable_desc_leaf,
-        }
-        if key_type not in LEAF_PARSERS or not LEAF_PARSERS[key_type]:
+        parser = self.__leaf_parsers.get(key_type)
+        if not parser:
             raise OSError('Key {0} is not supported.'.format(key_type))
-        return LEAF_PARSERS[key_type](data)
-
-    def _merge_common_keys(self, defined_keys):
-        keys = self._COMMON_KEYS
-        if defined_keys:
-            keys = dict(keys)
-            keys.update(defined_keys)
-        return keys
+        return parser(data)
 
     #
     # 7.5.4 Descriptors
     #
-    def _parse_descriptor_directory(self, ctx, key_type, entries):
-        # See annotation of Table 16 – Key definitions.
-        DEFINED_KEYS = {
-            KeyType.DESCRIPTOR:             (EntryType.LEAF,
-                                             EntryType.DIRECTORY, ),
-            KeyType.MODIFIABLE_DESCRIPTOR:  (EntryType.LEAF, ),
-        }
+    # See annotation of Table 16 – Key definitions.
+    _DESCRIPTOR_KEYS = _compile_keys({
+        KeyType.DESCRIPTOR:             (EntryType.LEAF,
+                                         EntryType.DIRECTORY, ),
+        KeyType.MODIFIABLE_DESCRIPTOR:  (EntryType.LEAF, ),
+    })
 
+    def _parse_descriptor_directory(self, ctx, key_type, entries):
         return self._parse_directory_entries(key_type, ctx, entries,
-                                             DEFINED_KEYS)
+                                             self._DESCRIPTOR_KEYS)
 
     #
     # 7.7.1 Bus_Dependent_Info entry
     #
-    def _parse_bus_dependent_directory(self, ctx, key_type, entries):
-        # See explanation of Table 8 – Key ID allocations
-        DEFINED_KEYS = {
-            KeyType.BUS_DEPENDENT_INFO: (EntryType.IMMEDIATE,
-                                         EntryType.CSR_OFFSET,
-                                         EntryType.LEAF, ),
-        }
+    # See explanation of Table 8 – Key ID allocations
+    _BUS_DEPENDENT_KEYS = _compile_keys({
+        KeyType.BUS_DEPENDENT_INFO: (EntryType.IMMEDIATE,
+                                     EntryType.CSR_OFFSET,
+                                     EntryType.LEAF, ),
+    })
 
+    def _parse_bus_dependent_directory(self, ctx, key_type, entries):
         ctx = (DirectoryContext.BUS_DEPENDENT, self._NAME)
 
         return self._parse_directory_entries(key_type, ctx, entries,
-                                             DEFINED_KEYS)
+                                             self._BUS_DEPENDENT_KEYS)
 
     #
     # 7.7.3 Vendor_Info entry
@@ -340,7 +382,7 @@ class Ieee1212RootDirectoryParser():
             ctx = (DirectoryContext.VENDOR, vendor_id)
 
         return self._parse_directory_entries(key_type, ctx, entries,
-                                             self._COMMON_KEYS)
+                                             self._COMPILED_COMMON_KEYS)
 
     #
     # 7.7.6 Module_Info entry
@@ -348,7 +390,7 @@ class Ieee1212RootDirectoryParser():
     def _parse_module_directory(self, ctx, key_type, entries):
         # See explanation of Table 8 – Key ID allocations.
         for entry in entries:
-            if entry[0] == (KeyType.SPECIFIER_ID.value. EntryType.IMMEDIATE):
+            if entry[0] == (KeyType.SPECIFIER_ID.value, EntryType.IMMEDIATE):
                 vendor_id = entry[1]
                 break
         else:
@@ -363,22 +405,22 @@ class Ieee1212RootDirectoryParser():
             ctx = (DirectoryContext.VENDOR, vendor_id)
 
         return self._parse_directory_entries(key_type, ctx, entries,
-                                             self._COMMON_KEYS)
+                                             self._COMPILED_COMMON_KEYS)
 
     #
     # 7.6.4 Feature directories
     #
-    def _parse_feature_directory(self, ctx, key_type, entries):
-        DEFINED_KEYS = {
-            # name:  (key_type, available types of parser)
-            KeyType.SPECIFIER_ID:   (EntryType.IMMEDIATE, ),
-            KeyType.VERSION:        (EntryType.IMMEDIATE, ),
-            KeyType.DEPENDENT_INFO: (EntryType.IMMEDIATE,
-                                     EntryType.CSR_OFFSET,
-                                     EntryType.LEAF,
-                                     EntryType.DIRECTORY, ),
-        }
+    _FEATURE_KEYS = _compile_keys({
+        # name:  (key_type, available types of parser)
+        KeyType.SPECIFIER_ID:   (EntryType.IMMEDIATE, ),
+        KeyType.VERSION:        (EntryType.IMMEDIATE, ),
+        KeyType.DEPENDENT_INFO: (EntryType.IMMEDIATE,
+                                 EntryType.CSR_OFFSET,
+                                 EntryType.LEAF,
+                                 EntryType.DIRECTORY, ),
+    }, _COMMON_KEYS)
 
+    def _parse_feature_directory(self, ctx, key_type, entries):
         # Mandatory entries are required to decide directory context.
         for entry in entries:
             if entry[0] == (KeyType.SPECIFIER_ID.value, EntryType.IMMEDIATE):
@@ -391,29 +433,28 @@ class Ieee1212RootDirectoryParser():
                 'Mandatory entries are missing in feature directory.')
         ctx = (DirectoryContext.SPECIFIER, (specifier_id, version))
 
-        keys = self._merge_common_keys(DEFINED_KEYS)
-
-        return self._parse_directory_entries(key_type, ctx, entries, keys)
+        return self._parse_directory_entries(key_type, ctx, entries,
+                                             self._FEATURE_KEYS)
 
     #
     # 7.6.3 Unit directories
     #
-    def _parse_unit_directory(self, ctx, key_type, entries):
-        DEFINED_KEYS = {
-            # name:  (key_type, available types of parser)
-            KeyType.VENDOR:         (EntryType.IMMEDIATE,
-                                     EntryType.LEAF,
-                                     EntryType.DIRECTORY, ),
-            KeyType.MODEL:          (EntryType.IMMEDIATE, ),
-            KeyType.SPECIFIER_ID:   (EntryType.IMMEDIATE, ),
-            KeyType.VERSION:        (EntryType.IMMEDIATE, ),
-            KeyType.DEPENDENT_INFO: (EntryType.IMMEDIATE,
-                                     EntryType.CSR_OFFSET,
-                                     EntryType.LEAF,
-                                     EntryType.DIRECTORY, ),
-            KeyType.FEATURE:        (EntryType.DIRECTORY, ),
-        }
+    _UNIT_KEYS = _compile_keys({
+        # name:  (key_type, available types of parser)
+        KeyType.VENDOR:         (EntryType.IMMEDIATE,
+                                 EntryType.LEAF,
+                                 EntryType.DIRECTORY, ),
+        KeyType.MODEL:          (EntryType.IMMEDIATE, ),
+        KeyType.SPECIFIER_ID:   (EntryType.IMMEDIATE, ),
+        KeyType.VERSION:        (EntryType.IMMEDIATE, ),
+        KeyType.DEPENDENT_INFO: (EntryType.IMMEDIATE,
+                                 EntryType.CSR_OFFSET,
+                                 EntryType.LEAF,
+                                 EntryType.DIRECTORY, ),
+        KeyType.FEATURE:        (EntryType.DIRECTORY, ),
+    }, _COMMON_KEYS)
 
+    def _parse_unit_directory(self, ctx, key_type, entries):
         # Mandatory entries are required to decide directory context.
         for entry in entries:
             if entry[0] == (KeyType.SPECIFIER_ID.value, EntryType.IMMEDIATE):
@@ -426,9 +467,8 @@ class Ieee1212RootDirectoryParser():
                 'Mandatory entries are missing in unit directory.')
         ctx = (DirectoryContext.SPECIFIER, (specifier_id, version))
 
-        keys = self._merge_common_keys(DEFINED_KEYS)
-
-        return self._parse_directory_entries(key_type, ctx, entries, keys)
+        return self._parse_directory_entries(key_type, ctx, entries,
+                                             self._UNIT_KEYS)
 
     #
     # 7.7.12 Dependent_Info entry
@@ -448,25 +488,25 @@ class Ieee1212RootDirectoryParser():
             pass
 
         return self._parse_directory_entries(key_type, ctx, entries,
-                                             self._COMMON_KEYS)
+                                             self._COMPILED_COMMON_KEYS)
 
     #
     # 7.6.2 Instance directories
     #
-    def _parse_instance_directory(self, ctx, key_type, entries):
-        DEFINED_KEYS = {
-            # name:  (key_type, available types of parser)
-            KeyType.VENDOR:         (EntryType.IMMEDIATE,
-                                     EntryType.LEAF,
-                                     EntryType.DIRECTORY, ),
-            KeyType.KEYWORD:        (EntryType.LEAF, ),
-            KeyType.FEATURE:        (EntryType.DIRECTORY, ),
-            KeyType.INSTANCE:       (EntryType.DIRECTORY, ),
-            KeyType.UNIT:           (EntryType.DIRECTORY, ),
-            KeyType.MODEL:          (EntryType.IMMEDIATE, ),
-            KeyType.DEPENDENT_INFO: (EntryType.DIRECTORY, ),
-        }
+    _INSTANCE_KEYS = _compile_keys({
+        # name:  (key_type, available types of parser)
+        KeyType.VENDOR:         (EntryType.IMMEDIATE,
+                                 EntryType.LEAF,
+                                 EntryType.DIRECTORY, ),
+        KeyType.KEYWORD:        (EntryType.LEAF, ),
+        KeyType.FEATURE:        (EntryType.DIRECTORY, ),
+        KeyType.INSTANCE:       (EntryType.DIRECTORY, ),
+        KeyType.UNIT:           (EntryType.DIRECTORY, ),
+        KeyType.MODEL:          (EntryType.IMMEDIATE, ),
+        KeyType.DEPENDENT_INFO: (EntryType.DIRECTORY, ),
+    }, _COMMON_KEYS)
 
+    def _parse_instance_directory(self, ctx, key_type, entries):
         # Mandatory entries are required to decide directory context.
         for entry in entries:
             if entry[0] == (KeyType.KEYWORD, EntryType.IMMEDIATE):
@@ -478,84 +518,60 @@ class Ieee1212RootDirectoryParser():
 
         ctx = (DirectoryContext.KEYWORD, keyword)
 
-        keys = self._merge_common_keys(DEFINED_KEYS)
-
-        return self._parse_directory_entries(key_type, ctx, entries, keys)
+        return self._parse_directory_entries(key_type, ctx, entries,
+                                             self._INSTANCE_KEYS)
 
     def _parse_directory(self, key_type, ctx, entries):
-        DIRECTORY_PARSERS = {
-            KeyType.DESCRIPTOR:         self._parse_descriptor_directory,
-            KeyType.BUS_DEPENDENT_INFO: self._parse_bus_dependent_directory,
-            KeyType.VENDOR:             self._parse_vendor_directory,
-            KeyType.MODULE:             self._parse_module_directory,
-            KeyType.FEATURE:            self._parse_feature_directory,
-            KeyType.UNIT:               self._parse_unit_directory,
-            KeyType.DEPENDENT_INFO:     self._parse_dependent_info_directory,
-            KeyType.INSTANCE:           self._parse_instance_directory,
-        }
-
-        return DIRECTORY_PARSERS[key_type](ctx, key_type, entries)
+        return self.__directory_parsers[key_type](ctx, key_type, entries)
 
     def _parse_directory_entries(self, dir_key_type, ctx, entries, keys):
-        TYPE_PARSERS = {
-            EntryType.IMMEDIATE:    self.__parse_immediate,
-            EntryType.CSR_OFFSET: lambda key_type, ctx, data: data,
-            EntryType.LEAF:         self._parse_leaf,
-            EntryType.DIRECTORY:    self._parse_directory,
-        }
-        EXTERNAL_HANDLES = {
-            DirectoryContext.VENDOR:        self._vendor_dep_handles,
-            DirectoryContext.SPECIFIER:     self._spec_dep_handles,
-            DirectoryContext.BUS_DEPENDENT: self._bus_dep_handles,
-            DirectoryContext.KEYWORD:       self._keyword_dep_handles,
-        }
+        # The keys is a set of pairs of key ID and entry type.
+        if self.__dispatch_table is None:
+            self.__dispatch_table = self.__compile_dispatch_table()
+        handles = self.__dispatch_table.get(ctx, ())
+
         info = []
 
         for entry in entries:
             key = entry[0]
             data = entry[1]
-            parser = TYPE_PARSERS[key[1]]
-
-            key_type = KeyType(key[0]) if KeyType.check_value(key[0]) else None
 
-            if key_type in keys and key[1] in keys[key_type]:
+            if key in keys:
+                key_type = _KEY_TYPES[key[0]]
+                parser = self.__type_parsers[key[1]]
                 elem = [key_type.name, parser(key_type, ctx, data)]
             else:
-                ctx_name, ctx_value = ctx
-                if ctx_value not in EXTERNAL_HANDLES[ctx_name]:
-                    elem = entry
+                for handle in handles:
+                    elem = handle(key[0], key[1].name, data)
+                    if elem:
+                        break
                 else:
-                    for handle in EXTERNAL_HANDLES[ctx_name][ctx_value]:
-                        elem = handle(key[0], key[1].name, data)
-                        if elem:
-                            break
-                    else:
-                        elem = entry
+                    elem = entry
 
             info.append(elem)
 
         return info
 
-    def parse_root_directory(self, bus_name, entries):
-        DEFINED_KEYS = {
-            # key_type:  available types of parser
-            KeyType.BUS_DEPENDENT_INFO: (EntryType.IMMEDIATE,
-                                         EntryType.CSR_OFFSET,
-                                         EntryType.LEAF, ),
-            KeyType.VENDOR:             (EntryType.IMMEDIATE,
-                                         EntryType.LEAF,
-                                         EntryType.DIRECTORY, ),
-            KeyType.HARDWARE_VERSION:   (EntryType.IMMEDIATE, ),
-            KeyType.MODULE:             (EntryType.LEAF,
-                                         EntryType.DIRECTORY, ),
-            KeyType.NODE_CAPABILITIES:  (EntryType.IMMEDIATE, ),
-            KeyType.INSTANCE:           (EntryType.DIRECTORY, ),
-            KeyType.UNIT:               (EntryType.DIRECTORY, ),
-            KeyType.MODEL:              (EntryType.IMMEDIATE, ),
-            KeyType.DEPENDENT_INFO:     (EntryType.DIRECTORY, ),
-            # Node_Unique_ID was obsoleted.
-        }
+    _ROOT_KEYS = _compile_keys({
+        # key_type:  available types of parser
+        KeyType.BUS_DEPENDENT_INFO: (EntryType.IMMEDIATE,
+                                     EntryType.CSR_OFFSET,
+                                     EntryType.LEAF, ),
+        KeyType.VENDOR:             (EntryType.IMMEDIATE,
+                                     EntryType.LEAF,
+                                     EntryType.DIRECTORY, ),
+        KeyType.HARDWARE_VERSION:   (EntryType.IMMEDIATE, ),
+        KeyType.MODULE:             (EntryType.LEAF,
+                                     EntryType.DIRECTORY, ),
+        KeyType.NODE_CAPABILITIES:  (EntryType.IMMEDIATE, ),
+        KeyType.INSTANCE:           (EntryType.DIRECTORY, ),
+        KeyType.UNIT:               (EntryType.DIRECTORY, ),
+        KeyType.MODEL:              (EntryType.IMMEDIATE, ),
+        KeyType.DEPENDENT_INFO:     (EntryType.DIRECTORY, ),
+        # Node_Unique_ID was obsoleted.
+    }, _COMMON_KEYS)
 
+    def parse_root_directory(self, bus_name, entries):
         # Mandatory entries are required to decide directory context.
         for entry in entries:
             if entry[0] == (KeyType.VENDOR.value, EntryType.IMMEDIATE):
@@ -567,6 +583,5 @@ class Ieee1212RootDirectoryParser():
 
         self._bus_name = bus_name
 
-        keys = self._merge_common_keys(DEFINED_KEYS)
-
-        return self._parse_directory_entries(KeyType.ROOT, ctx, entries, keys)
+        return self._parse_directory_entries(KeyType.ROOT, ctx, entries,
+                                             self._ROOT_KEYS)
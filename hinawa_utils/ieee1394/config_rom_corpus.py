@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import json
+from pathlib import Path
+from struct import pack, unpack_from
+
+__all__ = ['ConfigRomCorpus']
+
+
+class ConfigRomCorpus():
+    # Binary format of corpus, in big endian:
+    #  header:  magic 'HCRC', version (u16), reserved (u16).
+    #  record:  length of metadata (u32), metadata as JSON in UTF-8,
+    #           length of image (u32), image of configuration ROM.
+    #
+    # Metadata includes 'name' at least. The name of parser class expected to
+    # accept the image can be in 'parser'.
+    MAGIC = b'HCRC'
+    VERSION = 1
+
+    @classmethod
+    def load(cls, path):
+        with Path(path).open(mode='rb') as f:
+            data = f.read()
+        if len(data) < 8 or data[0:4] != cls.MAGIC:
+            raise ValueError('Invalid format of corpus: {0}'.format(path))
+        version = unpack_from('>H', data, 4)[0]
+        if version != cls.VERSION:
+            raise ValueError('Unsupported version of corpus: {0}'.format(
+                version))
+
+        records = []
+        view = memoryview(data)
+        offset = 8
+        while offset < len(data):
+            length = unpack_from('>I', view, offset)[0]
+            offset += 4
+            metadata = json.loads(view[offset:offset + length].tobytes()
+                                  .decode('utf-8'))
+            offset += length
+            length = unpack_from('>I', view, offset)[0]
+            offset += 4
+            image = view[offset:offset + length].tobytes()
+            if len(image) != length:
+                raise ValueError('Truncated record in corpus: {0}'.format(
+                    path))
+            offset += length
+            records.append((metadata, image))
+        return records
+
+    @classmethod
+    def save(cls, path, records):
+        data = bytearray(cls.MAGIC)
+        data.extend(pack('>HH', cls.VERSION, 0))
+        for metadata, image in records:
+            literal = json.dumps(metadata, sort_keys=True).encode('utf-8')
+            data.extend(pack('>I', len(literal)))
+            data.extend(literal)
+            data.extend(pack('>I', len(image)))
+            data.extend(bytes(image))
+        with Path(path).open(mode='wb') as f:
+            f.write(data)
+
+    @classmethod
+    def append(cls, path, metadata, image):
+        records = []
+        if Path(path).exists():
+            records = cls.load(path)
+        records.append((metadata, bytes(image)))
+        cls.save(path, records)
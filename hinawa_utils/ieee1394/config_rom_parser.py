@@ -59,6 +59,9 @@ class Ieee1394ConfigRomParser(Ieee1212RootDirectoryParser):
 
     def __init__(self):
         super().__init__()
+        # Raise ValueError for configuration ROM with CRC mismatch.
+        self.strict_crc = False
+        self.add_bus_dep_handle(self._NAME, self._handle_bus_dep_keys)
 
     def _parse_ieee1394_bus_info(self, data):
         info = {}
@@ -104,14 +107,18 @@ class Ieee1394ConfigRomParser(Ieee1212RootDirectoryParser):
         return None
 
     def parse_rom(self, data):
-        info = {}
+        entries = Ieee1212ConfigRomLexer.detect_entries(
+            data, strict=self.strict_crc)
+        return self.parse_entries(entries)
 
-        entries = Ieee1212ConfigRomLexer.detect_entries(data)
+    # Callers which lexed the image already give the entries to avoid lexing
+    # it again.
+    def parse_entries(self, entries):
+        info = {}
 
         bus_info = entries['bus-info']
         info['bus-info'] = self._parse_ieee1394_bus_info(bus_info)
 
-        self.add_bus_dep_handle(self._NAME, self._handle_bus_dep_keys)
         root = entries['root-directory']
         info['root-directory'] = self.parse_root_directory(self._NAME, root)
 
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from hinawa_utils.ta1394.general import AvcGeneral
+
+__all__ = ['AsyncUnit']
+
+
+class AsyncUnit():
+    # Transactions of libhinawa block the caller till the response arrives,
+    # thus they're executed in a worker thread dedicated to the unit. The
+    # transactions to one unit are serialized, while one event loop can
+    # drive several units concurrently.
+    def __init__(self, unit, loop=None):
+        self.unit = unit
+        self.__loop = loop
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+
+    def __run(self, func, *args, **kwargs):
+        loop = self.__loop
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.__executor,
+                                    partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        # Getters and setters of the unit are available as coroutine.
+        attr = getattr(self.unit, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return await self.__run(attr, *args, **kwargs)
+        method.__name__ = name
+        return method
+
+    async def call(self, func, *args, **kwargs):
+        return await self.__run(func, *args, **kwargs)
+
+    def __get_trx(self):
+        # Fireworks units have no engine for asynchronous transaction. Use
+        # efw_transaction() for them.
+        trx = getattr(self.unit, 'trx', None)
+        if trx is None:
+            raise ValueError('The unit has no engine for asynchronous '
+                             'transaction.')
+        return trx
+
+    async def read(self, addr, length, block=False, timeout=0):
+        return await self.__run(self.__get_trx().read, addr, length, block,
+                                timeout)
+
+    async def read_batch(self, ranges, gap=0, timeout=0):
+        return await self.__run(self.__get_trx().read_batch, ranges, gap,
+                                timeout)
+
+    async def write(self, addr, frames, block=False, timeout=0):
+        await self.__run(self.__get_trx().write, addr, frames, block,
+                         timeout)
+
+    async def lock(self, addr, arg, data, **kwargs):
+        return await self.__run(self.__get_trx().lock, addr, arg, data,
+                                **kwargs)
+
+    async def fcp_control(self, cmd):
+        return await self.__run(AvcGeneral.command_control, self.unit.fcp, cmd)
+
+    async def fcp_status(self, cmd):
+        return await self.__run(AvcGeneral.command_status, self.unit.fcp, cmd)
+
+    async def fcp_inquire(self, cmd):
+        return await self.__run(AvcGeneral.command_inquire, self.unit.fcp, cmd)
+
+    async def efw_transaction(self, category, cmd, args):
+        params = [0] * 256
+        return await self.__run(self.unit.transaction, category, cmd, args,
+                                params)
+
+    def release(self):
+        self.__executor.shutdown(wait=True)
+        self.unit.release()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, ex_type, ex_value, trace):
+        # The release of unit blocks till pending transactions finish.
+        await self.__run(self.unit.release)
+        self.__executor.shutdown(wait=True)
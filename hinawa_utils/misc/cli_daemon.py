@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import io
+import os
+import sys
+import json
+import socket
+import socketserver
+from contextlib import redirect_stdout
+from pathlib import Path
+from signal import signal, SIGTERM
+from threading import Thread
+
+__all__ = ['CliDaemon', 'CliClient']
+
+
+# The protocol is line-based JSON. A request is one of:
+#  {'op': 'command', 'args': [CMD, ARGS...]}
+#  {'op': 'shutdown'}
+# and the response is:
+#  {'result': bool, 'output': str}
+
+
+class CliDaemon():
+    @staticmethod
+    def get_socket_path(script, identity):
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir:
+            base = Path(runtime_dir, 'hinawa-utils')
+        else:
+            base = Path('/tmp', 'hinawa-utils-{0}'.format(os.getuid()))
+        name = '{0}-{1}.sock'.format(Path(script).name, identity)
+        return base.joinpath(name)
+
+    @staticmethod
+    def __prepare_socket_path(path):
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not path.exists():
+            return
+        # Remove stale socket.
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+        finally:
+            sock.close()
+        raise OSError('Daemon is already running: {0}'.format(str(path)))
+
+    @classmethod
+    def serve(cls, path, unit, execute):
+        # The execute is a callable with arguments of unit, command and
+        # arguments for the command.
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        req = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        break
+                    if req.get('op') == 'shutdown':
+                        resp = {'result': True, 'output': ''}
+                        Thread(target=self.server.shutdown).start()
+                    elif req.get('op') == 'command' and req.get('args'):
+                        resp = cls._execute(unit, execute, req['args'])
+                    else:
+                        resp = {'result': False, 'output': 'Invalid request'}
+                    data = json.dumps(resp) + '\n'
+                    self.wfile.write(data.encode('utf-8'))
+                    self.wfile.flush()
+
+        path = Path(path)
+        cls.__prepare_socket_path(path)
+
+        # Terminate by SIGTERM as well as SIGINT.
+        signal(SIGTERM, lambda signum, frame: sys.exit(0))
+
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(str(path), Handler)
+        finally:
+            os.umask(umask)
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if path.exists():
+                path.unlink()
+
+    @staticmethod
+    def _execute(unit, execute, args):
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                result = bool(execute(unit, args[0], args[1:]))
+        except Exception as e:
+            output.write('{0}\n'.format(e))
+            result = False
+        return {'result': result, 'output': output.getvalue()}
+
+
+class CliClient():
+    def __init__(self, path):
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.connect(str(path))
+        self.__rfile = self.__sock.makefile('rb')
+
+    def __request(self, req):
+        data = json.dumps(req) + '\n'
+        self.__sock.sendall(data.encode('utf-8'))
+        line = self.__rfile.readline()
+        if not line:
+            raise OSError('Daemon closed the connection.')
+        resp = json.loads(line.decode('utf-8'))
+        return resp['result'], resp['output']
+
+    def execute(self, args):
+        return self.__request({'op': 'command', 'args': list(args)})
+
+    def shutdown(self):
+        return self.__request({'op': 'shutdown'})
+
+    def close(self):
+        self.__rfile.close()
+        self.__sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ex_type, ex_value, trace):
+        self.close()
@@ -1,15 +1,20 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
+import os
 import sys
+import json
 import string
 from pathlib import Path
 from signal import SIGINT
 
 import gi
 gi.require_version('GLib', '2.0')
-gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import GLib
+
+from hinawa_utils.misc.profiler import TransactionProfiler
+from hinawa_utils.misc.cli_daemon import CliDaemon
+from hinawa_utils.misc.guid_resolver import GuidResolver
 
 __all__ = ['CliKit']
 
@@ -17,18 +22,7 @@ __all__ = ['CliKit']
 class CliKit():
     @staticmethod
     def _seek_snd_unit_from_guid(guid):
-        for fullpath in Path('/dev/snd').glob('hw*'):
-            fullpath = str(fullpath)
-            try:
-                unit = Hinawa.SndUnit()
-                unit.open(fullpath)
-                if unit.get_property('guid') == guid:
-                    return fullpath
-            except Exception as e:
-                pass
-            finally:
-                del unit
-        return None
+        return GuidResolver().resolve(guid)
 
     @staticmethod
     def _check_hexadecimal(literal):
@@ -48,6 +42,7 @@ class CliKit():
         print('  CARD:  the number as ALSA sound card, see /proc/asound/cards.')
         print('  GUID:  global unique ID for your unit.')
         print('  FILE:  path for a file with command list')
+        print('  daemon: keep the unit open for hinawa-cli-client')
         print('  CMD:   issue which you need')
         print('  ARGS:  arguments for the command')
 
@@ -75,9 +70,47 @@ class CliKit():
     def handle_unix_signal(cls, unit):
         del unit
 
+    @staticmethod
+    def _execute_command(unit, cmds, cmd, args):
+        profiler = getattr(unit, 'profiler', None)
+        if profiler is None:
+            return cmds[cmd](unit, args)
+        with profiler.operation(cmd):
+            return cmds[cmd](unit, args)
+
     @classmethod
     def dispatch_command(cls, unit, cmds):
+        # Transactions for each command are profiled and saved to the path
+        # in the environment variable as JSON.
+        path = os.environ.get('HINAWA_UTILS_PROFILE')
+        if not path:
+            return cls._dispatch_command(unit, cmds)
+
+        profiler = TransactionProfiler()
+        profiler.attach(unit)
+        try:
+            return cls._dispatch_command(unit, cmds)
+        finally:
+            profiler.detach(unit)
+            with open(path, 'w') as f:
+                json.dump(profiler.get_tables(), f, indent=2)
+
+    @classmethod
+    def _serve_daemon(cls, unit, cmds, script, identity):
+        def execute(unit, cmd, args):
+            if cmd not in cmds:
+                cls._dump_commands(cmds)
+                return False
+            return cls._execute_command(unit, cmds, cmd, args)
+        path = CliDaemon.get_socket_path(script, identity)
+        CliDaemon.serve(path, unit, execute)
+        return True
+
+    @classmethod
+    def _dispatch_command(cls, unit, cmds):
         args = sys.argv
+        if len(args) > 2 and args[2] == 'daemon':
+            return cls._serve_daemon(unit, cmds, args[0], args[1])
         if len(args) > 2:
             # Install signal handler to cancel event dispatcher.
             GLib.unix_signal_add(GLib.PRIORITY_HIGH, SIGINT,
@@ -85,7 +118,7 @@ class CliKit():
 
             if args[2] in cmds:
                 cmd = args[2]
-                return cmds[cmd](unit, args[3:])
+                return cls._execute_command(unit, cmds, cmd, args[3:])
             path = Path(args[2])
             if path.is_file():
                 with path.open(mode='r') as fh:
@@ -104,7 +137,8 @@ class CliKit():
                                 str(path), i, cmd))
                             return False
 
-                        if not cmds[cmd](unit, args[1:]):
+                        if not cls._execute_command(unit, cmds, cmd,
+                                                    args[1:]):
                             print('Invalid arguments in {0}:{1}: {2}'.format(
                                 str(path), i, cmd))
                             return False
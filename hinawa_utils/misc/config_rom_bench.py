@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from time import perf_counter
+
+from hinawa_utils.ieee1394.config_rom_parser import Ieee1394ConfigRomParser
+from hinawa_utils.ta1394.config_rom_parser import Ta1394ConfigRomParser
+from hinawa_utils.bebob.config_rom_parser import BebobConfigRomParser
+from hinawa_utils.dg00x.config_rom_parser import Dg00xConfigRomParser
+from hinawa_utils.efw.config_rom_parser import EfwConfigRomParser
+from hinawa_utils.fireface.ff_config_rom_parser import FFConfigRomParser
+from hinawa_utils.motu.config_rom_parser import MotuConfigRomParser
+from hinawa_utils.tscm.config_rom_parser import TscmConfigRomParser
+
+from hinawa_utils.ieee1394.config_rom_corpus import ConfigRomCorpus
+
+__all__ = ['ConfigRomBench']
+
+
+class ConfigRomBench():
+    # Feed each image in corpus to all of parsers. The generic parser and the
+    # parser expected in metadata of the image should accept it. Failures of
+    # the other parsers are not regressions, since family parsers reject
+    # images of the other families.
+    RESULT_VERSION = 1
+
+    PARSERS = (
+        Ieee1394ConfigRomParser,
+        Ta1394ConfigRomParser,
+        BebobConfigRomParser,
+        Dg00xConfigRomParser,
+        EfwConfigRomParser,
+        FFConfigRomParser,
+        MotuConfigRomParser,
+        TscmConfigRomParser,
+    )
+
+    @classmethod
+    def run(cls, paths, iterations=1):
+        records = []
+        for path in paths:
+            records.extend(ConfigRomCorpus.load(path))
+
+        results = {
+            'version':      cls.RESULT_VERSION,
+            'images':       len(records),
+            'iterations':   iterations,
+            'parsers':      {},
+            'regressions':  [],
+        }
+
+        for parser_cls in cls.PARSERS:
+            name = parser_cls.__name__
+            result = {
+                'parsed':   0,
+                'failures': 0,
+                'time':     0.0,
+            }
+            for metadata, image in records:
+                expected = metadata.get('parser') == name
+                elapsed = 0.0
+                try:
+                    for i in range(iterations):
+                        begin = perf_counter()
+                        parser_cls().parse_rom(image)
+                        elapsed += perf_counter() - begin
+                except Exception as e:
+                    result['failures'] += 1
+                    if expected or parser_cls is Ieee1394ConfigRomParser:
+                        results['regressions'].append(
+                            (metadata.get('name'), name, str(e)))
+                    continue
+                # Throughput is for accepted images only.
+                result['time'] += elapsed
+                result['parsed'] += 1
+            count = result['parsed'] * iterations
+            if result['time'] > 0:
+                result['throughput'] = count / result['time']
+            else:
+                result['throughput'] = 0.0
+            results['parsers'][name] = result
+
+        return results
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from threading import Thread, Lock
+
+import gi
+gi.require_version('GLib', '2.0')
+from gi.repository import GLib
+
+__all__ = ['GLibDispatcher', 'UnitDispatcher']
+
+
+class GLibDispatcher():
+    # A pool of threads which run GLib.MainLoop with their own
+    # GLib.MainContext. Sources are attached to the least-loaded context.
+    def __init__(self, threads=1):
+        if threads < 1:
+            raise ValueError('Invalid argument for the number of threads.')
+        self.__lock = Lock()
+        self.__loops = []
+        self.__sources = {}
+        for i in range(threads):
+            ctx = GLib.MainContext.new()
+            dispatcher = GLib.MainLoop.new(ctx, False)
+            th = Thread(target=lambda d: d.run(), args=(dispatcher, ))
+            th.start()
+            self.__loops.append({
+                'context':      ctx,
+                'dispatcher':   dispatcher,
+                'thread':       th,
+                'sources':      0,
+            })
+
+    def attach(self, src):
+        with self.__lock:
+            loop = min(self.__loops, key=lambda loop: loop['sources'])
+            src.attach(loop['context'])
+            loop['sources'] += 1
+            self.__sources[id(src)] = loop
+        return src
+
+    def detach(self, src):
+        with self.__lock:
+            if id(src) not in self.__sources:
+                raise ValueError('The source is not attached to dispatcher.')
+            loop = self.__sources.pop(id(src))
+            loop['sources'] -= 1
+        src.destroy()
+
+    def get_source_count(self):
+        with self.__lock:
+            return len(self.__sources)
+
+    def release(self):
+        for loop in self.__loops:
+            loop['dispatcher'].quit()
+        for loop in self.__loops:
+            loop['thread'].join()
+
+
+class UnitDispatcher():
+    # By default, each unit has dedicated threads to dispatch events from
+    # the unit and the node. When the shared dispatcher is enabled, units
+    # opened after that share its threads.
+    __shared = None
+    __shared_lock = Lock()
+
+    @classmethod
+    def enable_shared_dispatcher(cls, threads=1):
+        with cls.__shared_lock:
+            if cls.__shared is None:
+                cls.__shared = GLibDispatcher(threads)
+            return cls.__shared
+
+    @classmethod
+    def disable_shared_dispatcher(cls):
+        with cls.__shared_lock:
+            if cls.__shared is None:
+                return
+            if cls.__shared.get_source_count() > 0:
+                raise OSError('Some units still use the shared dispatcher.')
+            cls.__shared.release()
+            cls.__shared = None
+
+    def __init__(self, unit):
+        with self.__shared_lock:
+            self.__dispatcher = UnitDispatcher.__shared
+        self.__owned = self.__dispatcher is None
+        if self.__owned:
+            self.__dispatcher = GLibDispatcher(2)
+
+        self.__sources = []
+        for src in (unit.create_source(), unit.get_node().create_source()):
+            self.__sources.append(self.__dispatcher.attach(src))
+
+    def release(self):
+        for src in self.__sources:
+            self.__dispatcher.detach(src)
+        self.__sources = []
+        if self.__owned:
+            self.__dispatcher.release()
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import os
+import re
+import json
+from pathlib import Path
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+__all__ = ['GuidResolver']
+
+
+class GuidResolver():
+    # The map of GUID to the path of ALSA hwdep character device is cached in
+    # memory and on disk. Each entry is validated at use since the map is
+    # changed by hotplug.
+    CACHE_VERSION = 1
+
+    __SYSFS_SOUND = Path('/sys/class/sound')
+    __CARD_PATTERN = re.compile(r'hwC(\d+)D0$')
+
+    def __init__(self, cache_path=None):
+        if cache_path is None:
+            cache_dir = os.environ.get('XDG_CACHE_HOME')
+            if not cache_dir:
+                cache_dir = Path(Path.home(), '.cache')
+            cache_path = Path(cache_dir, 'hinawa-utils', 'guid-map.json')
+        self.__cache_path = Path(cache_path)
+        self.__entries = self.__load_cache()
+
+    def __load_cache(self):
+        try:
+            with self.__cache_path.open(mode='r') as f:
+                cache = json.load(f)
+            if cache.get('version') != self.CACHE_VERSION:
+                return {}
+            return {int(guid, base=16): path
+                    for guid, path in cache['entries'].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            return {}
+
+    def __save_cache(self):
+        cache = {
+            'version':  self.CACHE_VERSION,
+            'entries':  {'0x{0:016x}'.format(guid): path
+                         for guid, path in self.__entries.items()},
+        }
+        try:
+            self.__cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.__cache_path.open(mode='w') as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
+
+    @classmethod
+    def _read_sysfs_guid(cls, card):
+        # The sound card is on the unit of which parent is the node.
+        path = cls.__SYSFS_SOUND.joinpath('card{0}'.format(card), 'device',
+                                          '..', 'guid')
+        try:
+            with path.open(mode='r') as f:
+                return int(f.read().strip(), base=16)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def _scan_sysfs(cls):
+        entries = {}
+        for card_dir in cls.__SYSFS_SOUND.glob('card*'):
+            card = card_dir.name[4:]
+            if not card.isdigit():
+                continue
+            guid = cls._read_sysfs_guid(card)
+            if guid is not None:
+                entries[guid] = '/dev/snd/hwC{0}D0'.format(card)
+        return entries
+
+    @staticmethod
+    def _read_device_guid(path):
+        unit = Hinawa.SndUnit()
+        try:
+            unit.open(path)
+            return unit.get_property('guid')
+        except Exception:
+            return None
+        finally:
+            del unit
+
+    @classmethod
+    def _scan_devices(cls, guid):
+        for fullpath in Path('/dev/snd').glob('hw*'):
+            fullpath = str(fullpath)
+            if cls._read_device_guid(fullpath) == guid:
+                return fullpath
+        return None
+
+    def __validate(self, guid, path):
+        if self.__SYSFS_SOUND.is_dir():
+            match = self.__CARD_PATTERN.search(path)
+            if match is None:
+                return False
+            return self._read_sysfs_guid(match.group(1)) == guid
+        return self._read_device_guid(path) == guid
+
+    def resolve(self, guid):
+        path = self.__entries.get(guid)
+        if path is not None and self.__validate(guid, path):
+            return path
+
+        self.__entries.pop(guid, None)
+        if self.__SYSFS_SOUND.is_dir():
+            self.__entries.update(self._scan_sysfs())
+            path = self.__entries.get(guid)
+        else:
+            path = None
+
+        # Open each device as a fallback.
+        if path is None:
+            path = self._scan_devices(guid)
+            if path is not None:
+                self.__entries[guid] = path
+
+        self.__save_cache()
+        return path
+
+    def invalidate(self):
+        self.__entries = {}
+        self.__save_cache()
@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import os
+import json
+import tempfile
+from pathlib import Path
+
+__all__ = ['encode_value', 'decode_value', 'dump_atomically']
+
+
+# JSON has no representation for integer keys, tuples and bytes, thus they
+# are tagged.
+def encode_value(value):
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: encode_value(val) for key, val in value.items()}
+        return {'__items__': [[encode_value(key), encode_value(val)]
+                              for key, val in value.items()]}
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode_value(val) for val in value]}
+    if isinstance(value, list):
+        return [encode_value(val) for val in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': bytes(value).hex()}
+    return value
+
+
+def decode_value(value):
+    if isinstance(value, dict):
+        if '__items__' in value:
+            return {decode_value(key): decode_value(val)
+                    for key, val in value['__items__']}
+        if '__tuple__' in value:
+            return tuple(decode_value(val) for val in value['__tuple__'])
+        if '__bytes__' in value:
+            return bytes.fromhex(value['__bytes__'])
+        return {key: decode_value(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [decode_value(val) for val in value]
+    return value
+
+
+# The data is written to a temporary file in the same directory, then the
+# file is replaced at once so that concurrent or interrupted runs leave no
+# truncated file.
+def dump_atomically(path, data, **kwargs):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode='w') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp, str(path))
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from importlib import import_module
+from threading import Lock
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+from hinawa_utils.ieee1212.config_rom_lexer import Ieee1212ConfigRomLexer
+
+__all__ = ['ModelRegistry']
+
+
+class ModelRegistry():
+    # The registry identifies unit class for a configuration ROM by looking up
+    # an index built from tables of supported models in each family module.
+    # Keys of the index are one of:
+    #  ('model', vendor ID, model ID in root directory)
+    #  ('unit-model', vendor ID, model ID in unit directory)
+    #  ('unit-version', vendor ID, version in unit directory)
+    # and the value is a tuple of unit class, parser class and model name.
+    #
+    # The image is lexed once. The entries are used to look up the index, then
+    # given to the family parser, and the parsed information is given to the
+    # unit class.
+    __index = None
+    __lock = Lock()
+
+    # Root and unit directories in lexed entries.
+    __KEY_VENDOR = 0x03
+    __KEY_UNIT = 0x11
+    __KEY_SPECIFIER_ID = 0x12
+    __KEY_VERSION = 0x13
+    __KEY_MODEL = 0x17
+
+    @staticmethod
+    def __load(module, name):
+        return getattr(import_module('hinawa_utils.' + module), name)
+
+    @classmethod
+    def __build_index(cls):
+        index = {}
+
+        # Fireworks.
+        # The unit retrieves information by EFW transaction instead of the
+        # configuration ROM.
+        unit_cls = cls.__load('efw.efw_unit', 'EfwUnit')
+        parser_cls = None
+        eft_info = cls.__load('efw.transactions', 'EftInfo')
+        for name, model_id in eft_info.MODELS.items():
+            for vendor_id in (0x001486, 0x000ff2):
+                index[('model', vendor_id, model_id)] = \
+                    (unit_cls, parser_cls, name)
+
+        # Dice with TCD22xx.
+        unit_cls = cls.__load('dice.dice_extended_unit', 'DiceExtendedUnit')
+        parser_cls = cls.__load('ta1394.config_rom_parser',
+                                'Ta1394ConfigRomParser')
+        for spec in unit_cls.SPECS:
+            for vendor_id, model_id in spec.MODELS:
+                index[('model', vendor_id, model_id)] = \
+                    (unit_cls, parser_cls, spec.__name__)
+
+        # BeBoB.
+        parser_cls = cls.__load('bebob.config_rom_parser',
+                                'BebobConfigRomParser')
+        unit_cls = cls.__load('bebob.maudio_unit', 'MaudioUnit')
+        for vendor_id, model_id in unit_cls.SUPPORTED_MODELS:
+            index[('model', vendor_id, model_id)] = \
+                (unit_cls, parser_cls, unit_cls.__name__)
+        unit_cls = cls.__load('bebob.phase_go_unit', 'PhaseGoUnit')
+        for vendor_id, model_id in unit_cls.SUPPORTED_MODELS:
+            index[('model', vendor_id, model_id)] = \
+                (unit_cls, parser_cls, unit_cls.__name__)
+        unit_cls = cls.__load('bebob.edirol_fa', 'EdirolFaUnit')
+        for vendor_id, model_id in unit_cls.FBS:
+            index[('model', vendor_id, model_id)] = \
+                (unit_cls, parser_cls, unit_cls.__name__)
+
+        # MOTU.
+        unit_cls = cls.__load('motu.motu_unit', 'MotuUnit')
+        parser_cls = cls.__load('motu.config_rom_parser',
+                                'MotuConfigRomParser')
+        for model_id, (name, protocol) in unit_cls.SUPPORTED_MODELS.items():
+            index[('unit-model', 0x0001f2, model_id)] = \
+                (unit_cls, parser_cls, name)
+
+        # Fireface.
+        unit_cls = cls.__load('fireface.ff_unit', 'FFUnit')
+        parser_cls = cls.__load('fireface.ff_config_rom_parser',
+                                'FFConfigRomParser')
+        for version, name in unit_cls.MODELS.items():
+            index[('unit-version', 0x000a35, version)] = \
+                (unit_cls, parser_cls, name)
+
+        # TASCAM FireWire series.
+        parser_cls = cls.__load('tscm.config_rom_parser',
+                                'TscmConfigRomParser')
+        TSCM_MODELS = (
+            (0x800000, 'tscm_console_unit', 'TscmConsoleUnit', 'FW-1884'),
+            (0x800003, 'tscm_console_unit', 'TscmConsoleUnit', 'FW-1082'),
+            (0x800004, 'tscm_rack_unit', 'TscmRackUnit', 'FW-1804'),
+        )
+        for version, module, cls_name, name in TSCM_MODELS:
+            unit_cls = cls.__load('tscm.' + module, cls_name)
+            index[('unit-version', 0x00022e, version)] = \
+                (unit_cls, parser_cls, name)
+
+        return index
+
+    @classmethod
+    def get_index(cls):
+        with cls.__lock:
+            if cls.__index is None:
+                cls.__index = cls.__build_index()
+            return cls.__index
+
+    @classmethod
+    def __get_immediate(cls, entries, key_id):
+        for entry in entries:
+            if entry[0][0] == key_id and isinstance(entry[1], int):
+                return entry[1]
+        return None
+
+    @classmethod
+    def _detect_keys(cls, entries):
+        root = entries['root-directory']
+
+        vendor_id = cls.__get_immediate(root, cls.__KEY_VENDOR)
+        keys = [('model', vendor_id,
+                 cls.__get_immediate(root, cls.__KEY_MODEL))]
+
+        for entry in root:
+            if entry[0][0] != cls.__KEY_UNIT or \
+               not isinstance(entry[1], list):
+                continue
+            unit = entry[1]
+            specifier_id = cls.__get_immediate(unit, cls.__KEY_SPECIFIER_ID)
+            keys.append(('unit-model', vendor_id,
+                         cls.__get_immediate(unit, cls.__KEY_MODEL)))
+            keys.append(('unit-version', specifier_id,
+                         cls.__get_immediate(unit, cls.__KEY_VERSION)))
+
+        return keys
+
+    @classmethod
+    def __lookup_entries(cls, entries):
+        index = cls.get_index()
+        for key in cls._detect_keys(entries):
+            if key in index:
+                return index[key]
+        return None
+
+    @classmethod
+    def lookup(cls, rom):
+        return cls.__lookup_entries(Ieee1212ConfigRomLexer.detect_entries(rom))
+
+    @classmethod
+    def identify(cls, rom):
+        # The information is None for the unit class without parser.
+        entries = Ieee1212ConfigRomLexer.detect_entries(rom)
+        entry = cls.__lookup_entries(entries)
+        if entry is None:
+            raise OSError('Unsupported model.')
+        unit_cls, parser_cls, name = entry
+        if parser_cls is None:
+            return unit_cls, None
+        return unit_cls, parser_cls().parse_entries(entries)
+
+    @classmethod
+    def open(cls, path, base_cls=None):
+        # When the base class is given, units of the other classes are not
+        # opened, e.g. for CLI tools of a family.
+        unit = Hinawa.SndUnit()
+        unit.open(path)
+        rom = unit.get_node().get_config_rom()
+        del unit
+
+        unit_cls, info = cls.identify(rom)
+        if base_cls is not None and not issubclass(unit_cls, base_cls):
+            raise OSError('Unsupported model.')
+        if info is None:
+            return unit_cls(path)
+        return unit_cls(path, info)
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import os
+import json
+import hashlib
+from pathlib import Path
+
+from hinawa_utils.misc.json_codec import encode_value, decode_value
+from hinawa_utils.misc.json_codec import dump_atomically
+
+__all__ = ['ProbeCache']
+
+
+class ProbeCache():
+    # Results of probing static information of unit are cached in JSON file
+    # for each GUID. The file is invalidated when the content of configuration
+    # ROM is changed, or when the version of firmware is changed. Updating
+    # firmware often leaves the configuration ROM as is, thus each family
+    # gives the version of firmware read from the unit at each open.
+    VERSION = 2
+
+    def __init__(self, guid, config_rom, firmware=None, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = self.get_cache_dir()
+        self.__path = Path(cache_dir, '{0:016x}.json'.format(guid))
+        self.__rom_hash = hashlib.sha1(bytes(config_rom)).hexdigest()
+        self.__firmware = firmware
+        self.__entries = self.__load()
+
+    @classmethod
+    def from_unit(cls, unit, firmware=None):
+        node = unit.get_node()
+        return cls(unit.get_property('guid'), node.get_config_rom(), firmware)
+
+    @staticmethod
+    def get_cache_dir():
+        cache_dir = os.environ.get('XDG_CACHE_HOME')
+        if not cache_dir:
+            cache_dir = Path(Path.home(), '.cache')
+        return Path(cache_dir, 'hinawa-utils', 'probe')
+
+    @classmethod
+    def clear_all(cls, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = cls.get_cache_dir()
+        for path in Path(cache_dir).glob('*.json'):
+            path.unlink()
+
+    def __load(self):
+        try:
+            with self.__path.open(mode='r') as f:
+                cache = json.load(f)
+            if cache.get('version') != self.VERSION:
+                return {}
+            if cache.get('rom-hash') != self.__rom_hash:
+                return {}
+            if cache.get('firmware') != self.__firmware:
+                return {}
+            return dict(cache['entries'])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def __save(self):
+        cache = {
+            'version':  self.VERSION,
+            'rom-hash': self.__rom_hash,
+            'firmware': self.__firmware,
+            'entries':  self.__entries,
+        }
+        try:
+            dump_atomically(self.__path, cache)
+        except OSError:
+            pass
+
+    def get(self, name):
+        # A new object is returned in each call so that callers can modify it.
+        if name not in self.__entries:
+            return None
+        return decode_value(self.__entries[name])
+
+    def set(self, name, value):
+        self.__entries[name] = encode_value(value)
+        self.__save()
+
+    def probe(self, name, func):
+        value = self.get(name)
+        if value is None:
+            value = func()
+            self.set(name, value)
+        return value
+
+    def invalidate(self, name=None):
+        if name is None:
+            self.__entries = {}
+        else:
+            self.__entries.pop(name, None)
+        self.__save()
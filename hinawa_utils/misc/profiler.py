@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter
+
+__all__ = ['TransactionProfiler']
+
+
+class TransactionProfiler():
+    # Latency is counted in histogram with buckets of power of two in
+    # micro seconds.
+    TABLES = ('tcode', 'address', 'fcp', 'efw', 'operation')
+
+    def __init__(self, region_size=0x100, trace_size=0):
+        if region_size <= 0 or region_size & (region_size - 1):
+            raise ValueError('Invalid argument for size of address region.')
+        self.__region_mask = ~(region_size - 1)
+        self.__lock = Lock()
+        self.__local = local()
+        self.__tables = {}
+        for name in self.TABLES:
+            self.__tables[name] = {}
+        self.__trace = None
+        if trace_size > 0:
+            self.__trace = deque(maxlen=trace_size)
+
+    def attach(self, unit):
+        if hasattr(unit, 'trx'):
+            unit.trx.profiler = self
+        if hasattr(unit, 'fcp'):
+            unit.fcp.profiler = self
+        unit.profiler = self
+
+    def detach(self, unit):
+        if hasattr(unit, 'trx'):
+            unit.trx.profiler = None
+        if hasattr(unit, 'fcp'):
+            unit.fcp.profiler = None
+        unit.profiler = None
+
+    @contextmanager
+    def operation(self, name):
+        # Transactions in the context are attributed to the operation.
+        if not hasattr(self.__local, 'operations'):
+            self.__local.operations = []
+        # The pair of name and the number of transactions.
+        operation = [name, 0]
+        self.__local.operations.append(operation)
+        begin = perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = perf_counter() - begin
+            self.__local.operations.pop()
+            with self.__lock:
+                self.__count('operation', name, 0, elapsed)
+                entry = self.__tables['operation'][name]
+                entry['transactions'] = \
+                    entry.get('transactions', 0) + operation[1]
+
+    def __get_operation(self):
+        operations = getattr(self.__local, 'operations', None)
+        if not operations:
+            return None
+        return operations[-1]
+
+    def __count(self, table, key, length, elapsed):
+        entries = self.__tables[table]
+        if key not in entries:
+            entries[key] = {
+                'count':        0,
+                'bytes':        0,
+                'total':        0.0,
+                'min':          elapsed,
+                'max':          elapsed,
+                'histogram':    {},
+            }
+        entry = entries[key]
+        entry['count'] += 1
+        entry['bytes'] += length
+        entry['total'] += elapsed
+        entry['min'] = min(entry['min'], elapsed)
+        entry['max'] = max(entry['max'], elapsed)
+        bucket = 1 << int(elapsed * 1000000).bit_length()
+        entry['histogram'][bucket] = entry['histogram'].get(bucket, 0) + 1
+
+    def __record(self, kind, keys, addr, length, elapsed):
+        operation = self.__get_operation()
+        name = None
+        if operation is not None:
+            operation[1] += 1
+            name = operation[0]
+        with self.__lock:
+            for table, key in keys:
+                self.__count(table, key, length, elapsed)
+            if self.__trace is not None:
+                self.__trace.append((perf_counter(), name, kind, keys[0][1],
+                                     addr, length, elapsed))
+
+    def record_transaction(self, tcode, addr, length, elapsed):
+        name = getattr(tcode, 'value_nick', str(tcode))
+        keys = (('tcode', name),
+                ('address', addr & self.__region_mask))
+        self.__record('async', keys, addr, length, elapsed)
+
+    def record_fcp(self, cmd, elapsed):
+        keys = (('fcp', cmd[2]), )
+        self.__record('fcp', keys, None, len(cmd), elapsed)
+
+    def record_efw(self, category, cmd, length, elapsed):
+        keys = (('efw', category), )
+        self.__record('efw', keys, None, length, elapsed)
+
+    def get_tables(self):
+        with self.__lock:
+            tables = {}
+            for name, entries in self.__tables.items():
+                tables[name] = {}
+                for key, entry in entries.items():
+                    entry = dict(entry)
+                    entry['histogram'] = dict(entry['histogram'])
+                    tables[name][key] = entry
+            return tables
+
+    def get_trace(self):
+        with self.__lock:
+            if self.__trace is None:
+                return []
+            return list(self.__trace)
+
+    def reset(self):
+        with self.__lock:
+            for entries in self.__tables.values():
+                entries.clear()
+            if self.__trace is not None:
+                self.__trace.clear()
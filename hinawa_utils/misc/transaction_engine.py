@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from threading import Lock
+from time import perf_counter
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+__all__ = ['TransactionEngine']
+
+
+class TransactionEngine():
+    # The request objects and the frame buffers are reused for the lifetime of
+    # the unit, thus transactions are serialized.
+
+    # The maximum payload of asynchronous transaction at S100.
+    __MAX_PAYLOAD_AT_S100 = 512
+
+    def __init__(self, node):
+        self._node = node
+        self.__lock = Lock()
+        self.__reqs = {}
+        self.__frames = {}
+        self.__max_payload = 0
+        self.profiler = None
+
+    def __get_req(self, timeout):
+        if timeout not in self.__reqs:
+            if timeout > 0:
+                self.__reqs[timeout] = Hinawa.FwReq(timeout=timeout)
+            else:
+                self.__reqs[timeout] = Hinawa.FwReq()
+        return self.__reqs[timeout]
+
+    def __get_frames(self, length):
+        # Zero-filled frames are just used as placeholder for response.
+        if length not in self.__frames:
+            self.__frames[length] = bytes(length)
+        return self.__frames[length]
+
+    def transaction(self, tcode, addr, length, frames, timeout=0):
+        profiler = self.profiler
+        if profiler is None:
+            return self.__transaction(tcode, addr, length, frames, timeout)
+        begin = perf_counter()
+        frames = self.__transaction(tcode, addr, length, frames, timeout)
+        elapsed = perf_counter() - begin
+        profiler.record_transaction(tcode, addr, length, elapsed)
+        return frames
+
+    def __transaction(self, tcode, addr, length, frames, timeout):
+        with self.__lock:
+            # The node in simulation backend executes transaction by itself.
+            if not isinstance(self._node, Hinawa.FwNode):
+                return self._node.transaction(tcode, addr, length, frames)
+            req = self.__get_req(timeout)
+            return req.transaction(self._node, tcode, addr, length, frames)
+
+    def read(self, addr, length, block=False, timeout=0):
+        if length == 4 and not block:
+            tcode = Hinawa.FwTcode.READ_QUADLET_REQUEST
+        else:
+            tcode = Hinawa.FwTcode.READ_BLOCK_REQUEST
+        frames = self.transaction(tcode, addr, length,
+                                  self.__get_frames(length), timeout)
+        return bytearray(frames)
+
+    def write(self, addr, frames, block=False, timeout=0):
+        if len(frames) == 4 and not block:
+            tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
+        else:
+            tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
+        self.transaction(tcode, addr, len(frames), frames, timeout)
+
+    def lock(self, addr, arg, data, tcode=Hinawa.FwTcode.LOCK_COMPARE_SWAP,
+             timeout=0):
+        if len(arg) != len(data) or len(arg) not in (4, 8):
+            raise ValueError('Invalid argument for lock transaction.')
+        frames = bytearray(arg)
+        frames.extend(data)
+        frames = self.transaction(tcode, addr, len(frames), frames, timeout)
+        return bytearray(frames)
+
+    def get_max_payload(self):
+        # IEEE 1394 bus information block: max_rec in bus options quadlet.
+        if self.__max_payload == 0:
+            max_payload = self.__MAX_PAYLOAD_AT_S100
+            rom = self._node.get_config_rom()
+            if len(rom) >= 12:
+                max_rec = (rom[10] & 0xf0) >> 4
+                if max_rec > 0:
+                    max_payload = min(max_payload, 2 ** (max_rec + 1))
+            self.__max_payload = max_payload
+        return self.__max_payload
+
+    def plan_reads(self, ranges, gap=0):
+        # Merge ranges of which distance is within the gap, unless the merged
+        # range exceeds the maximum payload.
+        max_payload = self.get_max_payload()
+        blocks = []
+        for i in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+            addr, length = ranges[i]
+            if length <= 0:
+                raise ValueError('Invalid argument for length of read.')
+            if len(blocks) > 0:
+                block = blocks[-1]
+                end = max(block[0] + block[1], addr + length)
+                if addr <= block[0] + block[1] + gap and \
+                   end - block[0] <= max_payload:
+                    block[1] = end - block[0]
+                    block[2].append(i)
+                    continue
+            blocks.append([addr, length, [i]])
+        return blocks
+
+    def read_batch(self, ranges, gap=0, timeout=0):
+        # The list of (address, length) is read with as few transactions as
+        # possible. The results are returned in the same order as the list.
+        ranges = list(ranges)
+        results = [None] * len(ranges)
+        for addr, length, indices in self.plan_reads(ranges, gap):
+            if len(indices) == 1:
+                results[indices[0]] = self.read(addr, length, timeout=timeout)
+                continue
+            frames = self.read(addr, length, block=True, timeout=timeout)
+            for i in indices:
+                begin = ranges[i][0] - addr
+                results[i] = frames[begin:begin + ranges[i][1]]
+        return results
@@ -9,9 +9,9 @@ __all__ = ['MotuConfigRomParser']
 class MotuConfigRomParser(Ieee1394ConfigRomParser):
     __OUI_MOTU = 0x0001f2
 
-    def parse_rom(self, data):
-        entries = super().parse_rom(data)
-        return self.__parse_entries(entries['root-directory'])
+    def parse_entries(self, entries):
+        info = super().parse_entries(entries)
+        return self.__parse_entries(info['root-directory'])
 
     def __parse_entries(self, entries):
         FIELDS = (
@@ -3,10 +3,6 @@
 
 from abc import ABCMeta, abstractmethod
 
-import gi
-gi.require_version('Hinawa', '2.0')
-from gi.repository import Hinawa
-
 __all__ = ['MotuProtocolAbstract']
 
 
@@ -38,34 +34,22 @@ class MotuProtocolAbstract(metaclass=ABCMeta):
         self._debug = bool(debug)
 
     def read(self, offset, size):
-        req = Hinawa.FwReq()
-        if size == 4:
-            tcode = Hinawa.FwTcode.READ_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.READ_BLOCK_REQUEST
         addr = self.BASE_ADDR + offset
-        frames = bytearray(size)
-        frames = req.transaction(self._unit.get_node(), tcode, addr, size,
-                                 frames)
+        frames = self._unit.trx.read(addr, size)
         if self._debug:
             print('    read: {0:012x}:'.format(addr))
             for i, frame in enumerate(frames):
                 print('        {0:04x}: {1:02x}'.format(offset + i, frame))
-        return bytearray(frames)
+        return frames
 
     def write(self, offset, frames):
-        req = Hinawa.FwReq(timeout=100)
-        if len(frames) == 4:
-            tcode = Hinawa.FwTcode.WRITE_QUADLET_REQUEST
-        else:
-            tcode = Hinawa.FwTcode.WRITE_BLOCK_REQUEST
         addr = self.BASE_ADDR + offset
         if self._debug:
             print('    write: {0:012x}:'.format(addr))
             for i, frame in enumerate(frames):
                 print('        {0:04x}: {1:02x}'.format(offset + i, frame))
 
-        req.transaction(self.get_node(), tcode, addr, len(frames), frames)
+        self._unit.trx.write(addr, frames, timeout=100)
 
     @abstractmethod
     def get_supported_sampling_rates(self):
@@ -1,12 +1,12 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
-
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
+from hinawa_utils.misc.transaction_engine import TransactionEngine
 
 from hinawa_utils.motu.motu_protocol_v1 import MotuProtocolV1
 from hinawa_utils.motu.motu_protocol_v2 import MotuProtocolV2
@@ -27,27 +27,19 @@ class MotuUnit(Hinawa.SndMotu):
         0x000033: ('AudioExpress', MotuProtocolV3),
     }
 
-    def __init__(self, path):
+    def __init__(self, path, info=None):
         super().__init__()
         self.open(path)
         if self.get_property('type') != 7:
             raise ValueError('The character device is not for Motu unit.')
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
+        self.__dispatcher = UnitDispatcher(self)
 
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
+        self.trx = TransactionEngine(self.get_node())
 
-        parser = MotuConfigRomParser()
-        info = parser.parse_rom(self.get_node().get_config_rom())
+        if info is None:
+            info = MotuConfigRomParser().parse_rom(
+                self.get_node().get_config_rom())
 
         if info['model-id'] in self.SUPPORTED_MODELS:
             name, protocol = self.SUPPORTED_MODELS[info['model-id']]
@@ -57,10 +49,7 @@ class MotuUnit(Hinawa.SndMotu):
             raise OSError('Unsupported model')
 
     def release(self):
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
 
     def __enter__(self):
         return self
@@ -272,11 +272,7 @@ class InputCmd():
 
     @classmethod
     def get_meters(cls, unit: Hinawa.FwUnit):
-        req = Hinawa.FwReq()
-        frames = bytearray(8)
-        frames = req.transaction(unit.get_node(),
-                                 Hinawa.FwTcode.READ_BLOCK_REQUEST,
-                                 cls.__ADDR_IN_METERS, 8, frames)
+        frames = unit.trx.read(cls.__ADDR_IN_METERS, 8)
         vals = unpack('>2I', frames)
         meters = {
             'analog-1': vals[0],
@@ -420,11 +416,7 @@ class MixerCmd():
 
     @classmethod
     def get_meters(cls, unit: Hinawa.FwUnit):
-        req = Hinawa.FwReq()
-        frames = bytearray(16)
-        frames = req.transaction(unit.get_node(),
-                                 Hinawa.FwTcode.READ_BLOCK_REQUEST,
-                                 cls.__ADDR_SRC_LEVELS, 16, frames)
+        frames = unit.trx.read(cls.__ADDR_SRC_LEVELS, 16)
         vals = unpack('>4I', frames)
         meters = {
             'stream-1': vals[0],
@@ -1,14 +1,16 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
 from struct import unpack
 from time import sleep
 
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
+from hinawa_utils.misc.transaction_engine import TransactionEngine
+from hinawa_utils.misc.probe_cache import ProbeCache
 
 from hinawa_utils.ta1394.config_rom_parser import Ta1394ConfigRomParser
 from hinawa_utils.ta1394.general import AvcConnection
@@ -18,43 +20,42 @@ __all__ = ['OxfwUnit']
 
 
 class OxfwUnit(Hinawa.SndUnit):
-    def __init__(self, path):
+    def __init__(self, path, info=None):
         super().__init__()
         self.open(path)
         if self.get_property('type') != 4:
             raise ValueError('The character device is not for OXFW unit')
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
-
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
-
-        parser = Ta1394ConfigRomParser()
-        info = parser.parse_rom(self.get_node().get_config_rom())
+        self.__dispatcher = UnitDispatcher(self)
+
+        self.trx = TransactionEngine(self.get_node())
+
+        if info is None:
+            info = Ta1394ConfigRomParser().parse_rom(
+                self.get_node().get_config_rom())
         self.vendor_name = info['vendor-name']
         self.model_name = info['model-name']
 
-        self.fcp = Hinawa.FwFcp()
-        self.fcp.bind(self.get_node())
+        self.fcp = self._create_fcp()
 
         self.hw_info = self._parse_hardware_info()
-        self.supported_sampling_rates = self._parse_supported_sampling_rates()
-        self.supported_stream_formats = self._parse_supported_stream_formats()
+
+        self.probe_cache = ProbeCache.from_unit(self, self.hw_info)
+        formats = self.probe_cache.probe('oxfw-stream-formats',
+                                         self._probe_stream_formats)
+        self.supported_sampling_rates = formats['sampling-rates']
+        self.supported_stream_formats = formats['stream-formats']
+        self._playback_only = formats['playback-only']
+        self._assumed = formats['assumed']
 
     def release(self):
         self.fcp.unbind()
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
+
+    def _create_fcp(self):
+        fcp = Hinawa.FwFcp()
+        fcp.bind(self.get_node())
+        return fcp
 
     def __enter__(self):
         return self
@@ -65,22 +66,26 @@ class OxfwUnit(Hinawa.SndUnit):
     def _parse_hardware_info(self):
         hw_info = {}
 
-        req = Hinawa.FwReq()
-
-        frames = bytearray(4)
-        frames = req.transaction(self.get_node(),
-                Hinawa.FwTcode.READ_QUADLET_REQUEST, 0xfffff0050000, 4, frames)
+        frames = self.trx.read(0xfffff0050000, 4)
         hw_info['asic-type'] = 'FW{0:x}'.format(
             unpack('>H', frames[0:2])[0] >> 4)
         hw_info['firmware-version'] = '{0}.{1}'.format(frames[2], frames[3])
 
-        frames = bytearray(4)
-        frames = req.transaction(self.get_node(),
-                Hinawa.FwTcode.READ_QUADLET_REQUEST, 0xfffff0090020, 4, frames)
+        frames = self.trx.read(0xfffff0090020, 4)
         hw_info['asic-id'] = frames.decode('US-ASCII').rstrip('\0')
 
         return hw_info
 
+    def _probe_stream_formats(self):
+        self.supported_sampling_rates = self._parse_supported_sampling_rates()
+        self.supported_stream_formats = self._parse_supported_stream_formats()
+        return {
+            'sampling-rates':   self.supported_sampling_rates,
+            'stream-formats':   self.supported_stream_formats,
+            'playback-only':    self._playback_only,
+            'assumed':          self._assumed,
+        }
+
     def _parse_supported_sampling_rates(self):
         sampling_rates = {}
         playback = []
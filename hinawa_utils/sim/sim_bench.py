@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import io
+import sys
+import runpy
+import platform
+from contextlib import redirect_stdout
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter, strftime
+
+from hinawa_utils.sim.sim_profile import SimProfile
+from hinawa_utils.sim.sim_unit import SimUnit
+
+__all__ = ['SimBench']
+
+
+class SimBench():
+    # Replay command list in test directory against simulated unit. The
+    # profile for the unit is expected to be in the same directory with the
+    # same name as the command list.
+    RESULT_VERSION = 1
+
+    @staticmethod
+    def _load_namespace(script):
+        # The scripts dump help and skip opening unit without arguments, then
+        # the table of commands is available in their global namespace.
+        argv = sys.argv
+        sys.argv = [str(script)]
+        try:
+            with redirect_stdout(io.StringIO()):
+                namespace = runpy.run_path(str(script), run_name='__main__')
+        except SystemExit:
+            raise OSError('Fail to load commands from {0}'.format(script))
+        finally:
+            sys.argv = argv
+        return namespace
+
+    @staticmethod
+    def _get_cmds(namespace, script, unit):
+        # Some scripts build the table according to features of unit, e.g.
+        # hinawa-fireworks-cli.
+        if 'cmds' in namespace:
+            return namespace['cmds']
+        if 'get_available_commands' in namespace and hasattr(unit, 'info'):
+            return namespace['get_available_commands'](unit.info['features'])
+        raise OSError('No commands in {0}'.format(script))
+
+    @staticmethod
+    def _load_unit_class(name):
+        module_name, class_name = name.rsplit('.', 1)
+        return getattr(import_module(module_name), class_name)
+
+    @staticmethod
+    def _percentile(samples, ratio):
+        # Nearest rank method.
+        index = int(ratio * len(samples) + 0.5) - 1
+        return samples[min(max(index, 0), len(samples) - 1)]
+
+    @staticmethod
+    def _collect_stats(unit):
+        stats = dict(unit.get_node().stats)
+        if hasattr(unit, 'fcp'):
+            stats['fcp'] = unit.fcp.stats['transactions']
+            stats['bytes'] += unit.fcp.stats['bytes']
+        if hasattr(unit, 'efw_stats'):
+            stats['efw'] = unit.efw_stats['transactions']
+        return stats
+
+    @classmethod
+    def run_profile(cls, path):
+        path = Path(path)
+        profile = SimProfile(path)
+        if profile.unit is None or profile.script is None:
+            raise ValueError('Unit class and script are required: {0}'.format(
+                path))
+        cmds_path = path.with_suffix('.cmds')
+        script = Path(profile.script)
+        if not script.is_absolute():
+            script = path.parent.parent.joinpath(script)
+
+        namespace = cls._load_namespace(script)
+        unit_cls = cls._load_unit_class(profile.unit)
+
+        latencies = {}
+        failures = 0
+        count = 0
+
+        begin = perf_counter()
+        with SimUnit.open(unit_cls, path) as unit:
+            cmds = cls._get_cmds(namespace, script, unit)
+            with cmds_path.open(mode='r') as fh:
+                lines = [line.rstrip().split(' ') for line in fh]
+            for args in lines:
+                cmd = args[0]
+                if len(cmd) == 0 or cmd[0] == '#':
+                    continue
+                count += 1
+                if cmd not in cmds:
+                    failures += 1
+                    continue
+                start = perf_counter()
+                try:
+                    with redirect_stdout(io.StringIO()):
+                        result = cmds[cmd](unit, args[1:])
+                except Exception:
+                    result = False
+                elapsed = perf_counter() - start
+                if not result:
+                    failures += 1
+                if cmd not in latencies:
+                    latencies[cmd] = []
+                latencies[cmd].append(elapsed)
+            stats = cls._collect_stats(unit)
+        wall_time = perf_counter() - begin
+
+        commands = {}
+        for cmd, samples in latencies.items():
+            samples.sort()
+            commands[cmd] = {
+                'count':    len(samples),
+                'p50':      cls._percentile(samples, 0.50),
+                'p90':      cls._percentile(samples, 0.90),
+                'p99':      cls._percentile(samples, 0.99),
+            }
+
+        return {
+            'model':        profile.model,
+            'commands':     count,
+            'failures':     failures,
+            'wall-time':    wall_time,
+            'transactions': stats,
+            'latencies':    commands,
+        }
+
+    @classmethod
+    def run(cls, paths):
+        results = {
+            'version':      cls.RESULT_VERSION,
+            'date':         strftime('%Y-%m-%dT%H:%M:%S'),
+            'python':       platform.python_version(),
+            'profiles':     {},
+        }
+        for path in paths:
+            path = Path(path)
+            if path.is_dir():
+                targets = sorted(path.glob('*.json'))
+            else:
+                targets = [path]
+            for target in targets:
+                results['profiles'][target.stem] = cls.run_profile(target)
+        return results
+
+    @classmethod
+    def compare(cls, results, baseline):
+        # Yield (name, item, baseline value, current value) for each profile.
+        for name, current in results['profiles'].items():
+            if name not in baseline['profiles']:
+                continue
+            prev = baseline['profiles'][name]
+            yield (name, 'wall-time', prev['wall-time'], current['wall-time'])
+            for item, value in current['transactions'].items():
+                if item in prev['transactions']:
+                    yield (name, item, prev['transactions'][item], value)
@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from threading import Lock
+from time import sleep
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+__all__ = ['SimFcp']
+
+
+class SimFcp(Hinawa.FwFcp):
+    # AV/C General specification, Table 7.1 and 7.2.
+    __CTYPE_CONTROL = 0x00
+    __CTYPE_SPECIFIC_INQUIRY = 0x02
+    __RESPONSE_NOT_IMPLEMENTED = 0x08
+    __RESPONSE_ACCEPTED = 0x09
+    __RESPONSE_IMPLEMENTED = 0x0c
+
+    def __init__(self):
+        super().__init__()
+        self.__lock = Lock()
+        self.__node = None
+        self.stats = {
+            'transactions': 0,
+            'bytes':        0,
+        }
+
+    def bind(self, node):
+        self.__node = node
+
+    def unbind(self):
+        self.__node = None
+
+    def __lookup(self, cmd):
+        # The longest prefix in the table is preferred.
+        resp = None
+        matched = 0
+        for prefix, frames in self.__node.profile.fcp:
+            if len(prefix) > matched and cmd[:len(prefix)] == prefix:
+                resp = frames
+                matched = len(prefix)
+        return resp
+
+    def transaction(self, cmd, resp):
+        if self.__node is None:
+            raise OSError('FCP is not bound to any node.')
+        if self.__node.profile.latency > 0:
+            sleep(self.__node.profile.latency)
+
+        cmd = bytes(cmd)
+        with self.__lock:
+            self.stats['transactions'] += 1
+            self.stats['bytes'] += len(cmd)
+
+        frames = self.__lookup(cmd)
+        if frames is not None:
+            return bytearray(frames)
+
+        # Echo the command with default response.
+        frames = bytearray(cmd)
+        if cmd[0] == self.__CTYPE_CONTROL:
+            frames[0] = self.__RESPONSE_ACCEPTED
+        elif cmd[0] == self.__CTYPE_SPECIFIC_INQUIRY:
+            frames[0] = self.__RESPONSE_IMPLEMENTED
+        else:
+            frames[0] = self.__RESPONSE_NOT_IMPLEMENTED
+        return frames
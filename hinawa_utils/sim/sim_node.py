@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from threading import Lock
+from time import sleep
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+from hinawa_utils.sim.sim_fcp import SimFcp
+
+__all__ = ['SimSource', 'SimNode']
+
+
+class SimSource():
+    # Simulated node has no event to dispatch.
+    def attach(self, ctx):
+        return 0
+
+    def destroy(self):
+        pass
+
+
+class SimNode():
+    __READ_TCODES = (
+        Hinawa.FwTcode.READ_QUADLET_REQUEST,
+        Hinawa.FwTcode.READ_BLOCK_REQUEST,
+    )
+    __WRITE_TCODES = (
+        Hinawa.FwTcode.WRITE_QUADLET_REQUEST,
+        Hinawa.FwTcode.WRITE_BLOCK_REQUEST,
+    )
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.__lock = Lock()
+        self.__quads = {}
+        for addr, frames in profile.registers.items():
+            self.__write(addr, frames)
+        self.stats = {
+            'read':     0,
+            'write':    0,
+            'lock':     0,
+            'bytes':    0,
+        }
+
+    def get_config_rom(self):
+        return self.profile.config_rom
+
+    def create_source(self):
+        return SimSource()
+
+    def __read(self, addr, length):
+        base = addr & ~0x03
+        frames = bytearray()
+        for quad_addr in range(base, addr + length, 4):
+            frames.extend(self.__quads.get(quad_addr, bytes(4)))
+        offset = addr - base
+        return frames[offset:offset + length]
+
+    def __write(self, addr, frames):
+        base = addr & ~0x03
+        offset = addr - base
+        length = (offset + len(frames) + 3) & ~0x03
+        quads = self.__read(base, length)
+        quads[offset:offset + len(frames)] = frames
+        for i in range(0, length, 4):
+            self.__quads[base + i] = bytes(quads[i:i + 4])
+
+    def transaction(self, tcode, addr, length, frames):
+        if self.profile.latency > 0:
+            sleep(self.profile.latency)
+
+        with self.__lock:
+            if tcode in self.__READ_TCODES:
+                self.stats['read'] += 1
+                frames = self.__read(addr, length)
+            elif tcode in self.__WRITE_TCODES:
+                self.stats['write'] += 1
+                self.__write(addr, bytes(frames[:length]))
+            elif tcode == Hinawa.FwTcode.LOCK_COMPARE_SWAP:
+                self.stats['lock'] += 1
+                size = length // 2
+                arg = bytes(frames[:size])
+                data = bytes(frames[size:length])
+                frames = self.__read(addr, size)
+                if frames == arg:
+                    self.__write(addr, data)
+            else:
+                raise OSError('Unsupported transaction code: {0}'.format(
+                    tcode))
+            self.stats['bytes'] += length
+
+        return frames
+
+    def create_fcp(self):
+        fcp = SimFcp()
+        fcp.bind(self)
+        return fcp
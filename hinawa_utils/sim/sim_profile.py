@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import json
+from pathlib import Path
+
+__all__ = ['SimProfile']
+
+
+class SimProfile():
+    # Profile of simulated unit in JSON format:
+    #  'model':         name of model.
+    #  'type':          the value of 'type' property of Hinawa.SndUnit.
+    #  'guid':          hexadecimal literal of GUID.
+    #  'unit':          full name of unit class (optional).
+    #  'script':        path to CLI script relative to top directory
+    #                   (optional).
+    #  'latency':       seconds to wait for each transaction (optional).
+    #  'config-rom':    hexadecimal literal of configuration ROM.
+    #  'registers':     map of hexadecimal address to hexadecimal literal of
+    #                   initial content.
+    #  'fcp':           list of {'command', 'response'} for AV/C FCP, in which
+    #                   'command' is hexadecimal literal of prefix of command.
+    #  'efw':           list of {'category', 'command', 'response'} for EFW,
+    #                   in which 'response' is list of quadlets. Commands not
+    #                   in the list are answered with zero.
+    def __init__(self, path):
+        self.path = Path(path)
+        with self.path.open(mode='r') as f:
+            profile = json.load(f)
+
+        self.model = profile.get('model', self.path.stem)
+        self.type = profile['type']
+        self.guid = int(profile.get('guid', '0'), base=16)
+        self.unit = profile.get('unit')
+        self.script = profile.get('script')
+        self.latency = float(profile.get('latency', 0))
+        self.config_rom = self.__parse_hex(profile['config-rom'])
+
+        self.registers = {}
+        for addr, literal in profile.get('registers', {}).items():
+            self.registers[int(addr, base=16)] = self.__parse_hex(literal)
+
+        self.fcp = []
+        for entry in profile.get('fcp', []):
+            cmd = self.__parse_hex(entry['command'])
+            resp = self.__parse_hex(entry['response'])
+            self.fcp.append((cmd, resp))
+
+        self.efw = {}
+        for entry in profile.get('efw', []):
+            key = (entry['category'], entry['command'])
+            self.efw[key] = list(entry['response'])
+
+    @staticmethod
+    def __parse_hex(literal):
+        return bytes.fromhex(literal.replace('0x', ''))
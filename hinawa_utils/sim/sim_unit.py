@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from struct import pack
+from threading import Lock
+from time import sleep
+
+import gi
+gi.require_version('Hinawa', '2.0')
+from gi.repository import Hinawa
+
+from hinawa_utils.sim.sim_profile import SimProfile
+from hinawa_utils.sim.sim_node import SimSource, SimNode
+
+__all__ = ['SimUnitMixin', 'SimEfwMixin', 'SimDiceMixin', 'SimUnit']
+
+
+class SimUnitMixin():
+    # Replace methods of Hinawa.SndUnit and its derived classes so that the
+    # unit classes in this package operate with simulated node. The path
+    # for open() is the one of profile.
+    def open(self, path):
+        self._sim_profile = SimProfile(path)
+        self._sim_node = SimNode(self._sim_profile)
+        self._sim_properties = {
+            'type':         self._sim_profile.type,
+            'guid':         self._sim_profile.guid,
+            'streaming':    False,
+            'card':         0,
+            'device':       str(path),
+        }
+
+    def get_property(self, name):
+        if name in self._sim_properties:
+            return self._sim_properties[name]
+        return super().get_property(name)
+
+    def get_node(self):
+        return self._sim_node
+
+    def create_source(self):
+        return SimSource()
+
+    def _create_fcp(self):
+        return self._sim_node.create_fcp()
+
+
+class SimEfwMixin(SimUnitMixin):
+    # Replace EFW transaction of Hinawa.SndEfw. The response in profile is
+    # padded with zero to the length of given parameters, thus commands not
+    # in profile are answered with zero.
+    def open(self, path):
+        super().open(path)
+        self._sim_efw_lock = Lock()
+        self.efw_stats = {
+            'transactions': 0,
+        }
+
+    def transaction(self, category, cmd, args, params):
+        if self._sim_profile.latency > 0:
+            sleep(self._sim_profile.latency)
+        with self._sim_efw_lock:
+            self.efw_stats['transactions'] += 1
+        resp = list(self._sim_profile.efw.get((category, cmd), []))
+        if len(resp) < len(params):
+            resp.extend([0] * (len(params) - len(resp)))
+        return resp
+
+
+class SimDiceMixin(SimUnitMixin):
+    # Replace the transaction of Hinawa.SndDice to wait for notification. The
+    # quadlets are written to simulated node, which never notifies.
+    def transaction(self, addr, quads, bit_flag):
+        frames = bytearray()
+        for quad in quads:
+            frames.extend(pack('>I', quad))
+        self._sim_node.transaction(Hinawa.FwTcode.WRITE_BLOCK_REQUEST, addr,
+                                   len(frames), frames)
+
+
+class SimUnit():
+    # GObject type is registered for each derived class, thus the derived
+    # classes are cached.
+    __classes = {}
+    __lock = Lock()
+
+    @staticmethod
+    def __get_mixin(unit_cls):
+        if issubclass(unit_cls, Hinawa.SndEfw):
+            return SimEfwMixin
+        if issubclass(unit_cls, Hinawa.SndDice):
+            return SimDiceMixin
+        return SimUnitMixin
+
+    @classmethod
+    def get_class(cls, unit_cls):
+        with cls.__lock:
+            if unit_cls not in cls.__classes:
+                name = 'Sim' + unit_cls.__name__
+                mixin = cls.__get_mixin(unit_cls)
+                cls.__classes[unit_cls] = type(name, (mixin, unit_cls), {})
+            return cls.__classes[unit_cls]
+
+    @classmethod
+    def open(cls, unit_cls, path):
+        return cls.get_class(unit_cls)(path)
@@ -3,7 +3,7 @@
 
 from struct import unpack, pack
 
-from hinawa_utils.ta1394.general import AvcGeneral
+from hinawa_utils.ta1394.general import AvcGeneral, AvcCommandTemplate
 
 __all__ = ['AvcAudio']
 
@@ -23,101 +23,149 @@ class AvcAudio():
         'delta':        0x19,
     }
 
+    __SUBUNIT_ADDRS = {i: 0x08 | i for i in range(8)}
+    __SELECTOR_ATTRS = {attr: value for attr, value in ATTRIBUTE_VALUES.items()
+                        if attr in ('current', 'minimum', 'maximum',
+                                    'default')}
+    __MUTE_ATTRS = {'current': ATTRIBUTE_VALUES['current']}
+    __MIXER_ATTRS = {attr: value for attr, value in ATTRIBUTE_VALUES.items()
+                     if attr in ('current', 'minimum', 'maximum',
+                                 'resolution', 'default')}
+
+    _SET_SELECTOR_STATE = AvcCommandTemplate('set-selector-state', (
+        0x00, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x80,   # Selector function block
+        'fb_id', ('attr', __SELECTOR_ATTRS),
+        0x02,   # Selector length is 2
+        'value',
+        0x01,   # Selector control
+    ))
+
+    _GET_SELECTOR_STATE = AvcCommandTemplate('get-selector-state', (
+        0x01, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x80,   # Selector function block
+        'fb_id', ('attr', __SELECTOR_ATTRS),
+        0x02,   # Selector length is 2
+        0xff,
+        0x01,   # Selector control
+    ), lambda params: params[7])
+
+    _SET_FEATURE_MUTE_STATE = AvcCommandTemplate('set-feature-mute-state', (
+        0x00, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x81,   # Feature function block
+        'fb_id', ('attr', __MUTE_ATTRS),
+        0x02,   # Selector length is 2
+        'ch',
+        0x01,   # Mute control
+        0x01,   # Control data length is 1
+        ('mute', {True: 0x70, False: 0x60}),
+    ))
+
+    _GET_FEATURE_MUTE_STATE = AvcCommandTemplate('get-feature-mute-state', (
+        0x01, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x81,   # Feature function block
+        'fb_id', ('attr', __MUTE_ATTRS),
+        0x02,   # Selector length is 2
+        'ch',
+        0x01,   # Mute control
+        0x01,   # Control data length is 1
+        0xff,   # Status
+    ), lambda params: params[10])
+
+    _SET_FEATURE_VOLUME_STATE = AvcCommandTemplate(
+        'set-feature-volume-state', (
+            0x00, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+            0x81,   # Feature function block
+            'fb_id', ('attr', ATTRIBUTE_VALUES),
+            0x02,   # Selector length is 2
+            'ch',
+            0x02,   # Volume control
+            0x02,   # Control data length is 2
+            ('data', 2),    # Higher and lower parts of volume
+        ))
+
+    _GET_FEATURE_VOLUME_STATE = AvcCommandTemplate(
+        'get-feature-volume-state', (
+            0x01, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+            0x81,   # Feature function block
+            'fb_id', ('attr', ATTRIBUTE_VALUES),
+            0x02,   # Selector length is 2
+            'ch',
+            0x02,   # Volume control
+            0x02,   # Control data length is 2
+            0xff,   # Higher part of volume
+            0xff,   # Lower part of volume
+        ), lambda params: params[10:12])
+
+    _SET_FEATURE_LR_STATE = AvcCommandTemplate('set-feature-lr-state', (
+        0x00, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x81,   # Feature function block
+        'fb_id', ('attr', ATTRIBUTE_VALUES),
+        0x02,   # Selector length is 2
+        'ch',
+        0x03,   # LR control
+        0x02,   # Control data length is 2
+        ('data', 2),    # Higher and lower parts of balance
+    ))
+
+    _GET_FEATURE_LR_STATE = AvcCommandTemplate('get-feature-lr-state', (
+        0x01, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+        0x81,   # Feature function block
+        'fb_id', ('attr', ATTRIBUTE_VALUES),
+        0x02,   # Selector length is 2
+        'ch',
+        0x03,   # LR control
+        0x02,   # Control data length is 2
+        0xff,   # Higher part of balance
+        0xff,   # Lower part of balance
+    ), lambda params: params[10:12])
+
+    _SET_PROCESSING_MIXER_STATE = AvcCommandTemplate(
+        'set-processing-mixer-state', (
+            0x00, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+            0x82,   # Processing function block
+            'fb_id', ('attr', __MIXER_ATTRS),
+            0x04,   # Selector length is 4
+            'in_fb', 'in_ch', 'out_ch',
+            0x03,   # Mixer control
+            0x02,   # Control data is 2
+            ('data', 2),    # Higher and lower parts of setting
+        ))
+
+    _GET_PROCESSING_MIXER_STATE = AvcCommandTemplate(
+        'get-processing-mixer-state', (
+            0x01, ('subunit_id', __SUBUNIT_ADDRS), 0xb8,
+            0x82,   # Processing function block
+            'fb_id', ('attr', __MIXER_ATTRS),
+            0x04,   # Selector length is 4
+            'in_fb', 'in_ch', 'out_ch',
+            0x03,   # Mixer control
+            0x02,   # Control data is 2
+            0xff,   # Higher part of setting
+            0xff,   # Lower part of setting
+        ), lambda params: params[12:14])
+
     @classmethod
     def set_selector_state(cls, fcp, subunit_id, attr, fb_id, value):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in ('current', 'minimum', 'maximum', 'default'):
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if value > 255:
-            raise ValueError('Invalid argument for selector value')
-        args = bytearray()
-        args.append(0x00)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x80)   # Selector function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(value)
-        args.append(0x01)   # Selector control
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_SELECTOR_STATE.execute(fcp, subunit_id=subunit_id, attr=attr,
+                                        fb_id=fb_id, value=value)
 
     @classmethod
     def get_selector_state(cls, fcp, subunit_id, attr, fb_id):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in ('current', 'minimum', 'maximum', 'default'):
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x80)   # Selector function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(0xff)
-        args.append(0x01)   # Selector control
-        params = AvcGeneral.command_status(fcp, args)
-        return params[7]
+        return cls._GET_SELECTOR_STATE.execute(fcp, subunit_id=subunit_id,
+                                               attr=attr, fb_id=fb_id)
 
     @classmethod
     def set_feature_mute_state(cls, fcp, subunit_id, attr, fb_id, ch, mute):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr is not 'current':
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        if mute:
-            val = 0x70
-        else:
-            val = 0x60
-        args = bytearray()
-        args.append(0x00)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x01)   # Mute control
-        args.append(0x01)   # Control data length is 1
-        args.append(val)
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_FEATURE_MUTE_STATE.execute(fcp, subunit_id=subunit_id,
+                                            attr=attr, fb_id=fb_id, ch=ch,
+                                            mute=bool(mute))
 
     @classmethod
     def get_feature_mute_state(cls, fcp, subunit_id, attr, fb_id, ch):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr is not 'current':
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x01)   # Mute control
-        args.append(0x01)   # Control data length is 1
-        args.append(0xff)   # Status
-        params = AvcGeneral.command_status(fcp, args)
-        val = params[10]
+        val = cls._GET_FEATURE_MUTE_STATE.execute(fcp, subunit_id=subunit_id,
+                                                  attr=attr, fb_id=fb_id,
+                                                  ch=ch)
         if val == 0x70:
             return True
         elif val == 0x60:
@@ -127,178 +175,39 @@ class AvcAudio():
 
     @classmethod
     def set_feature_volume_state(cls, fcp, subunit_id, attr, fb_id, ch, data):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in cls.ATTRIBUTES:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        if len(data) != 2:
-            raise ValueError('Invalid argument for data array')
-        args = bytearray()
-        args.append(0x00)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x02)   # Volume control
-        args.append(0x02)   # Control data length is 2
-        args.extend(data)   # Higher and lower parts of volume
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_FEATURE_VOLUME_STATE.execute(fcp, subunit_id=subunit_id,
+                                              attr=attr, fb_id=fb_id, ch=ch,
+                                              data=data)
 
     @classmethod
     def get_feature_volume_state(cls, fcp, subunit_id, attr, fb_id, ch):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in cls.ATTRIBUTES:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x02)   # Volume control
-        args.append(0x02)   # Control data length is 2
-        args.append(0xff)   # Higher part of volume
-        args.append(0xff)   # Lower part of volume
-        params = AvcGeneral.command_status(fcp, args)
-        data = params[10:12]
-        return data
+        return cls._GET_FEATURE_VOLUME_STATE.execute(
+            fcp, subunit_id=subunit_id, attr=attr, fb_id=fb_id, ch=ch)
 
     @classmethod
     def set_feature_lr_state(cls, fcp, subunit_id, attr, fb_id, ch, data):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in cls.ATTRIBUTES:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        if len(data) != 2:
-            raise ValueError('Invalid argument for data array')
-        args = bytearray()
-        args.append(0x00)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x03)   # LR control
-        args.append(0x02)   # Control data length is 2
-        args.extend(data)   # Higher and lower parts of volume
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_FEATURE_LR_STATE.execute(fcp, subunit_id=subunit_id,
+                                          attr=attr, fb_id=fb_id, ch=ch,
+                                          data=data)
 
     @classmethod
     def get_feature_lr_state(cls, fcp, subunit_id, attr, fb_id, ch):
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in cls.ATTRIBUTES:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if ch > 255:
-            raise ValueError('Invalid argument for channel number')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x81)   # Feature function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x02)   # Selector length is 2
-        args.append(ch)
-        args.append(0x03)   # LR control
-        args.append(0x02)   # Control data length is 2
-        args.append(0xff)   # Higher part of balance
-        args.append(0xff)   # Lower part of balance
-        params = AvcGeneral.command_status(fcp, args)
-        data = params[10:12]
-        return data
+        return cls._GET_FEATURE_LR_STATE.execute(
+            fcp, subunit_id=subunit_id, attr=attr, fb_id=fb_id, ch=ch)
 
     @classmethod
     def set_processing_mixer_state(cls, fcp, subunit_id, attr, fb_id, in_fb,
                                    in_ch, out_ch, data):
-        attrs = ('current', 'minimum', 'maximum', 'resolution', 'default')
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in attrs:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if in_fb > 255:
-            raise ValueError('Invalid argument for input function block ID')
-        if in_ch > 255:
-            raise ValueError('Invalid argument for input channel number')
-        if out_ch > 255:
-            raise ValueError('Invalid argument for output channel number')
-        if len(data) != 2:
-            raise ValueError('Invalid argument for data array')
-        args = bytearray()
-        args.append(0x00)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x82)   # Processing function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x04)   # Selector length is 4
-        args.append(in_fb)
-        args.append(in_ch)
-        args.append(out_ch)
-        args.append(0x03)   # Mixer control
-        args.append(0x02)   # Control data is 2
-        args.extend(data)   # Higher and lower parts of setting
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_PROCESSING_MIXER_STATE.execute(
+            fcp, subunit_id=subunit_id, attr=attr, fb_id=fb_id, in_fb=in_fb,
+            in_ch=in_ch, out_ch=out_ch, data=data)
 
     @classmethod
     def get_processing_mixer_state(cls, fcp, subunit_id, attr, fb_id, in_fb,
                                    in_ch, out_ch):
-        attrs = ('current', 'minimum', 'maximum', 'resolution', 'default')
-        if subunit_id > 0x07:
-            raise ValueError('Invalid argument for subunit ID')
-        if attr not in attrs:
-            raise ValueError('Invalid argument for attribute')
-        if fb_id > 255:
-            raise ValueError('Invalid argument for function block ID')
-        if in_fb > 255:
-            raise ValueError('Invalid argument for input function block ID')
-        if in_ch > 255:
-            raise ValueError('Invalid argument for input channel number')
-        if out_ch > 255:
-            raise ValueError('Invalid argument for output channel number')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0x08 | (subunit_id & 0x07))
-        args.append(0xb8)
-        args.append(0x82)   # Processing function block
-        args.append(fb_id)
-        args.append(cls.ATTRIBUTE_VALUES[attr])
-        args.append(0x04)   # Selector length is 4
-        args.append(in_fb)
-        args.append(in_ch)
-        args.append(out_ch)
-        args.append(0x03)   # Mixer control
-        args.append(0x02)   # Control data is 2
-        args.append(0xff)   # Higher part of setting
-        args.append(0xff)   # Lower part of setting
-        params = AvcGeneral.command_status(fcp, args)
-        data = params[12:14]
-        return data
+        return cls._GET_PROCESSING_MIXER_STATE.execute(
+            fcp, subunit_id=subunit_id, attr=attr, fb_id=fb_id, in_fb=in_fb,
+            in_ch=in_ch, out_ch=out_ch)
 
     @classmethod
     def set_processing_mixer_state_all(cls, fcp, subunit_id, attr, fb_id, in_fb,
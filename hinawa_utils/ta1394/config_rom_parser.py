@@ -13,9 +13,9 @@ class Ta1394ConfigRomParser(Ieee1394ConfigRomParser):
     OUI_1394TA = 0x00a02d
     VERSION_AVC = 0x010001
 
-    def parse_rom(self, data):
-        entries = super().parse_rom(data)
-        return self.__parse_entries(entries['root-directory'])
+    def parse_entries(self, entries):
+        info = super().parse_entries(entries)
+        return self.__parse_entries(info['root-directory'])
 
     def __parse_entries(self, entries):
         # Recommended layout.
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+from threading import Lock
+from time import perf_counter, sleep
+
+__all__ = ['FcpScheduler']
+
+
+class FcpScheduler():
+    # STATUS and INQUIRY commands are issued again with bounded exponential
+    # backoff when the target is in transition. They have no effect on the
+    # state of target, while CONTROL and the others may have been executed
+    # even if the response is not delivered, thus they are never issued
+    # again. INTERIM response and failures of transaction are delivered to
+    # the caller as is. The response for the last try is returned.
+    CTYPE_STATUS = 0x01
+    CTYPE_INQUIRY = 0x02
+    RESPONSE_IN_TRANSITION = 0x0b
+    RESPONSE_INTERIM = 0x0f
+
+    def __init__(self, retries=5, interval=0.005, maximum_interval=0.16):
+        if retries < 0:
+            raise ValueError('Invalid argument for the number of retries.')
+        if interval <= 0 or maximum_interval < interval:
+            raise ValueError('Invalid argument for interval.')
+        self.retries = retries
+        self.interval = interval
+        self.maximum_interval = maximum_interval
+        self.__lock = Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__stats = {
+                'transactions': 0,
+                'retries':      0,
+                'interim':      0,
+                'in-transition': 0,
+                'errors':       0,
+                'failures':     0,
+                'wait':         0.0,
+                'total':        0.0,
+                'max':          0.0,
+            }
+
+    def get_stats(self):
+        with self.__lock:
+            return dict(self.__stats)
+
+    def __update(self, key, value=1):
+        with self.__lock:
+            self.__stats[key] += value
+
+    def transaction(self, fcp, cmd, request):
+        # The request is a callable with arguments of FCP and command, to
+        # return the response.
+        begin = perf_counter()
+        interval = self.interval
+        retriable = cmd[0] in (self.CTYPE_STATUS, self.CTYPE_INQUIRY)
+        try:
+            for i in range(self.retries + 1):
+                if i > 0:
+                    sleep(interval)
+                    self.__update('retries')
+                    self.__update('wait', interval)
+                    interval = min(interval * 2, self.maximum_interval)
+
+                try:
+                    params = request(fcp, cmd)
+                except Exception:
+                    self.__update('errors')
+                    raise
+
+                if params[0] == self.RESPONSE_INTERIM:
+                    self.__update('interim')
+                    return params
+                if params[0] != self.RESPONSE_IN_TRANSITION:
+                    return params
+                self.__update('in-transition')
+                if not retriable:
+                    return params
+            self.__update('failures')
+            return params
+        finally:
+            elapsed = perf_counter() - begin
+            with self.__lock:
+                self.__stats['transactions'] += 1
+                self.__stats['total'] += elapsed
+                self.__stats['max'] = max(self.__stats['max'], elapsed)
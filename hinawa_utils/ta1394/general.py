@@ -1,11 +1,15 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
+from time import perf_counter
+
 import gi
 gi.require_version('Hinawa', '2.0')
 from gi.repository import Hinawa
 
-__all__ = ['AvcGeneral', 'AvcConnection']
+from hinawa_utils.ta1394.fcp_scheduler import FcpScheduler
+
+__all__ = ['AvcGeneral', 'AvcCommandTemplate', 'AvcConnection']
 
 
 class AvcGeneral():
@@ -15,14 +19,40 @@ class AvcGeneral():
                      'music')
     MAXIMUM_SUBUNIT_PAGE = 0x7
 
+    # The buffer for response is copied by the binding, thus an immutable
+    # object is shared by all of transactions instead of allocating it per
+    # call.
+    _RESPONSE_BUFFER = bytes(256)
+
+    # The scheduler is shared by FCP objects without own one.
+    scheduler = FcpScheduler()
+
+    @classmethod
+    def _transaction(cls, fcp, cmd):
+        scheduler = getattr(fcp, 'scheduler', None)
+        if scheduler is None:
+            scheduler = cls.scheduler
+        return scheduler.transaction(fcp, cmd, cls._request)
+
+    @classmethod
+    def _request(cls, fcp, cmd):
+        profiler = getattr(fcp, 'profiler', None)
+        if profiler is None:
+            params = fcp.transaction(cmd, cls._RESPONSE_BUFFER)
+        else:
+            begin = perf_counter()
+            params = fcp.transaction(cmd, cls._RESPONSE_BUFFER)
+            profiler.record_fcp(cmd, perf_counter() - begin)
+        # Slices of the response are decoded as byte strings by callers.
+        return bytes(params)
+
     @classmethod
     def command_control(cls, fcp, cmd):
         if not isinstance(fcp, Hinawa.FwFcp):
             raise ValueError('Invalid argument for FwFcp')
         if cmd[0] != 0x00:
             raise ValueError('Invalid command code for control')
-        params = [0] * 256
-        params = fcp.transaction(cmd, params)
+        params = cls._transaction(fcp, cmd)
         if params[0] == 0x08:
             raise OSError('Not implemented')
         elif params[0] == 0x0a:
@@ -37,8 +67,7 @@ class AvcGeneral():
             raise ValueError('Invalid argument for FwFcp')
         if cmd[0] != 0x01:
             raise ValueError('Invalid command code for status')
-        params = [0] * 256
-        params = fcp.transaction(cmd, params)
+        params = cls._transaction(fcp, cmd)
         if params[0] == 0x08:
             raise OSError('Not implemented')
         elif params[0] == 0x0a:
@@ -55,10 +84,13 @@ class AvcGeneral():
             raise ValueError('Invalid argument for FwFcp')
         if cmd[0] != 0x02:
             raise ValueError('Invalid command code for inquire')
-        params = [0] * 256
-        params = fcp.transaction(cmd, params)
+        params = cls._transaction(fcp, cmd)
         if params[0] == 0x08:
             raise OSError('Not Implemented')
+        elif params[0] == 0x0a:
+            raise OSError('Rejected')
+        elif params[0] == 0x0b:
+            raise OSError('In transition')
         elif params[0] != 0x0c:
             raise OSError('Unknown status')
 
@@ -142,84 +174,147 @@ class AvcGeneral():
         return params[6:]
 
 
+class AvcCommandTemplate():
+    # The layout of frame is compiled at instantiation. Each field is one of:
+    #  int:         fixed byte.
+    #  str:         name of byte given by caller.
+    #  (str, int):  name of bytes given by caller, and the length.
+    #  (str, dict): name of byte given by caller, encoded by the dict.
+    # The type of command is decided by the first byte. The decoder is called
+    # with the response and its result is returned.
+    #
+    # All of templates are registered in the catalogue by name.
+    CATALOGUE = {}
+
+    def __init__(self, name, fields, decoder=None):
+        frame = bytearray()
+        slots = []
+        for field in fields:
+            if isinstance(field, int):
+                frame.append(field)
+                continue
+            if isinstance(field, str):
+                field = (field, 1)
+            label, spec = field
+            if isinstance(spec, int):
+                slots.append((label, len(frame), spec, None))
+                frame.extend(b'\xff' * spec)
+            else:
+                slots.append((label, len(frame), 1, dict(spec)))
+                frame.append(0xff)
+
+        if frame[0] not in (0x00, 0x01, 0x02):
+            raise ValueError('Invalid command code: {0}'.format(frame[0]))
+
+        self.name = name
+        self.ctype = frame[0]
+        self.__frame = bytes(frame)
+        self.__slots = tuple(slots)
+        self.__decoder = decoder
+
+        self.CATALOGUE[name] = self
+
+    def get_fields(self):
+        return tuple((label, offset, length)
+                     for label, offset, length, codes in self.__slots)
+
+    def build(self, **values):
+        frame = bytearray(self.__frame)
+        for label, offset, length, codes in self.__slots:
+            if label not in values:
+                raise ValueError('Missing argument for {0}'.format(label))
+            value = values[label]
+            try:
+                if codes is not None:
+                    frame[offset] = codes[value]
+                elif length == 1:
+                    frame[offset] = value
+                elif len(value) == length:
+                    frame[offset:offset + length] = value
+                else:
+                    raise ValueError()
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Invalid argument for {0}'.format(label))
+        return frame
+
+    def execute(self, fcp, **values):
+        frame = self.build(**values)
+        if self.ctype == 0x00:
+            params = AvcGeneral.command_control(fcp, frame)
+        elif self.ctype == 0x01:
+            params = AvcGeneral.command_status(fcp, frame)
+        else:
+            params = AvcGeneral.command_inquire(fcp, frame)
+        if self.__decoder is None:
+            return params
+        return self.__decoder(params)
+
+
 class AvcConnection():
     PLUG_DIRECTION = ('output', 'input')
     SAMPLING_RATES = (32000, 44100, 48000, 88200, 96000, 176400, 192000)
 
-    @classmethod
-    def get_unit_plug_info(cls, fcp):
-        args = bytearray()
-        args.append(0x01)
-        args.append(0xff)
-        args.append(0x02)   # Plug info
-        args.append(0x00)   # Serial Bus Isochronous and External Plug
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
-        return {'isoc': {
+    # Opcodes of INPUT/OUTPUT PLUG SIGNAL FORMAT commands.
+    __SIGNAL_FORMAT_OPCODES = {direction: 0x18 + i
+                               for i, direction in enumerate(PLUG_DIRECTION)}
+    __RATE_CODES = {rate: i for i, rate in enumerate(SAMPLING_RATES)}
+    __SUBUNIT_ADDRS = {(subunit_type, subunit_id): (i << 3) | subunit_id
+                       for i, subunit_type in enumerate(
+                           AvcGeneral.SUBUNIT_TYPES)
+                       for subunit_id in range(8)}
+
+    _UNIT_PLUG_INFO = AvcCommandTemplate('unit-plug-info', (
+        0x01, 0xff,
+        0x02,   # Plug info
+        0x00,   # Serial Bus Isochronous and External Plug
+        0xff, 0xff, 0xff, 0xff,
+    ), lambda params: {
+        'isoc': {
             'input':    params[4],
             'output':   params[5]},
-            'external': {
+        'external': {
             'input':    params[6],
-            'output':   params[7]}}
+            'output':   params[7]}})
+
+    # Consider that destination is input and source is output.
+    _SUBUNIT_PLUG_INFO = AvcCommandTemplate('subunit-plug-info', (
+        0x01, ('subunit', __SUBUNIT_ADDRS),
+        0x02, 0x00, 0xff, 0xff, 0xff, 0xff,
+    ), lambda params: {'input': params[4], 'output': params[5]})
+
+    _SET_PLUG_SIGNAL_FORMAT = AvcCommandTemplate('set-plug-signal-format', (
+        0x00, 0xff, ('direction', __SIGNAL_FORMAT_OPCODES), 'plug',
+        0x90, ('rate', __RATE_CODES), 0xff, 0xff,
+    ))
+
+    _GET_PLUG_SIGNAL_FORMAT = AvcCommandTemplate('get-plug-signal-format', (
+        0x01, 0xff, ('direction', __SIGNAL_FORMAT_OPCODES), 'plug',
+        0xff, 0xff, 0xff, 0xff,
+    ))
+
+    _ASK_PLUG_SIGNAL_FORMAT = AvcCommandTemplate('ask-plug-signal-format', (
+        0x02, 0xff, ('direction', __SIGNAL_FORMAT_OPCODES), 'plug',
+        0x90, ('rate', __RATE_CODES), 0xff, 0xff,
+    ))
+
+    @classmethod
+    def get_unit_plug_info(cls, fcp):
+        return cls._UNIT_PLUG_INFO.execute(fcp)
 
     @classmethod
     def get_subunit_plug_info(cls, fcp, subunit_type, subunit_id):
-        if subunit_type not in AvcGeneral.SUBUNIT_TYPES:
-            raise ValueError('Invalid argument for subunit type')
-        if subunit_id > 7:
-            raise ValueError('Invalid argument for subunit id')
-        args = bytearray()
-        args.append(0x01)
-        args.append((AvcGeneral.SUBUNIT_TYPES.index(
-            subunit_type) << 3) | subunit_id)
-        args.append(0x02)
-        args.append(0x00)
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
-        # Consider that destination is input and source is output.
-        return {'input': params[4], 'output': params[5]}
+        return cls._SUBUNIT_PLUG_INFO.execute(
+            fcp, subunit=(subunit_type, subunit_id))
 
     @classmethod
     def set_plug_signal_format(cls, fcp, direction, plug, rate):
-        if plug > 255:
-            raise ValueError('Invalid argument for plug number')
-        if direction not in AvcConnection.PLUG_DIRECTION:
-            raise ValueError('Invalid argument for plug direction')
-        if rate not in AvcConnection.SAMPLING_RATES:
-            raise ValueError('Invalid argument for sampling rate')
-        args = bytearray()
-        args.append(0x00)
-        args.append(0xff)
-        args.append(0x18 + AvcConnection.PLUG_DIRECTION.index(direction))
-        args.append(plug)
-        args.append(0x90)
-        args.append(AvcConnection.SAMPLING_RATES.index(rate))
-        args.append(0xff)
-        args.append(0xff)
-        AvcGeneral.command_control(fcp, args)
+        cls._SET_PLUG_SIGNAL_FORMAT.execute(fcp, direction=direction,
+                                            plug=plug, rate=rate)
 
     @classmethod
     def get_plug_signal_format(cls, fcp, direction, plug):
-        if plug > 255:
-            raise ValueError('Invalid argument for plug number')
-        if direction not in AvcConnection.PLUG_DIRECTION:
-            raise ValueError('Invalid argument for plug direction')
-        args = bytearray()
-        args.append(0x01)
-        args.append(0xff)
-        args.append(0x18 + AvcConnection.PLUG_DIRECTION.index(direction))
-        args.append(plug)
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        args.append(0xff)
-        params = AvcGeneral.command_status(fcp, args)
+        params = cls._GET_PLUG_SIGNAL_FORMAT.execute(fcp, direction=direction,
+                                                     plug=plug)
         param = params[5] & 0x07
         if param > len(AvcConnection.SAMPLING_RATES):
             raise OSError
@@ -227,23 +322,9 @@ class AvcConnection():
 
     @classmethod
     def ask_plug_signal_format(cls, fcp, direction, plug, rate):
-        if plug > 255:
-            raise ValueError('Invalid argument for plug number')
-        if direction not in AvcConnection.PLUG_DIRECTION:
-            raise ValueError('Invalid argument for plug direction')
-        if rate not in AvcConnection.SAMPLING_RATES:
-            raise ValueError('Invalid argument for sampling rate')
-        args = bytearray()
-        args.append(0x02)
-        args.append(0xff)
-        args.append(0x18 + AvcConnection.PLUG_DIRECTION.index(direction))
-        args.append(plug)
-        args.append(0x90)
-        args.append(AvcConnection.SAMPLING_RATES.index(rate))
-        args.append(0xff)
-        args.append(0xff)
         try:
-            AvcGeneral.command_inquire(fcp, args)
+            cls._ASK_PLUG_SIGNAL_FORMAT.execute(fcp, direction=direction,
+                                                plug=plug, rate=rate)
         except OSError:
             return False
         return True
@@ -24,9 +24,9 @@ class TscmConfigRomParser(Ieee1394ConfigRomParser):
             return ['MODEL_NAME', content[:content.find('\0')]]
         return None
 
-    def parse_rom(self, data):
-        entries = super().parse_rom(data)
-        return self.__parse_entries(entries['root-directory'])
+    def parse_entries(self, entries):
+        info = super().parse_entries(entries)
+        return self.__parse_entries(info['root-directory'])
 
     def __parse_entries(self, entries):
         # Typical layout.
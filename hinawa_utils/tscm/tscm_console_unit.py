@@ -7,8 +7,8 @@ __all__ = ['TscmConsoleUnit']
 
 
 class TscmConsoleUnit(TscmUnit):
-    def __init__(self, path):
-        super().__init__(path)
+    def __init__(self, path, info=None):
+        super().__init__(path, info)
 
         if self.model_name not in ('FW-1082', 'FW-1884'):
             raise ValueError('Unsupported model: {0}'.format(self.model_name))
@@ -21,8 +21,8 @@ class TscmRackUnit(TscmUnit):
     )
     _CH_FRAME_SIZE = 4
 
-    def __init__(self, path):
-        super().__init__(path)
+    def __init__(self, path, info=None):
+        super().__init__(path, info)
 
         if self.model_name != 'FW-1804':
             raise ValueError('Unsupported model: {0}'.format(self.model_name))
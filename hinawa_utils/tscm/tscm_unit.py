@@ -1,14 +1,15 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 # Copyright (C) 2018 Takashi Sakamoto
 
-from threading import Thread
 from struct import pack, unpack
 from math import log10, pow
 
 import gi
-gi.require_version('GLib', '2.0')
 gi.require_version('Hinawa', '2.0')
-from gi.repository import GLib, Hinawa
+from gi.repository import Hinawa
+
+from hinawa_utils.misc.dispatcher import UnitDispatcher
+from hinawa_utils.misc.transaction_engine import TransactionEngine
 
 from hinawa_utils.tscm.config_rom_parser import TscmConfigRomParser
 
@@ -40,35 +41,24 @@ class TscmUnit(Hinawa.SndUnit):
 
     __MAX_THRESHOLD = 0x7fff
 
-    def __init__(self, path):
+    def __init__(self, path, info=None):
         super().__init__()
         self.open(path)
         if self.get_property('type') != 6:
             raise ValueError('The character device is not for Tascam unit')
 
-        ctx = GLib.MainContext.new()
-        self.create_source().attach(ctx)
-        self.__unit_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__unit_th = Thread(target=lambda d: d.run(), args=(self.__unit_dispatcher, ))
-        self.__unit_th.start()
-
-        node = self.get_node()
-        ctx = GLib.MainContext.new()
-        node.create_source().attach(ctx)
-        self.__node_dispatcher = GLib.MainLoop.new(ctx, False)
-        self.__node_th = Thread(target=lambda d: d.run(), args=(self.__node_dispatcher, ))
-        self.__node_th.start()
-
-        parser = TscmConfigRomParser()
-        info = parser.parse_rom(self.get_node().get_config_rom())
+        self.__dispatcher = UnitDispatcher(self)
+
+        self.trx = TransactionEngine(self.get_node())
+
+        if info is None:
+            info = TscmConfigRomParser().parse_rom(
+                self.get_node().get_config_rom())
         self.model_name = info['model-name']
         self.__specs = self.__SPECS[self.model_name]
 
     def release(self):
-        self.__unit_dispatcher.quit()
-        self.__node_dispatcher.quit()
-        self.__unit_th.join()
-        self.__node_th.join()
+        self.__dispatcher.release()
 
     def __enter__(self):
         return self
@@ -77,28 +67,17 @@ class TscmUnit(Hinawa.SndUnit):
         self.release()
 
     def read_quadlet(self, offset):
-        req = Hinawa.FwReq()
-        frames = bytearray(4)
-        return req.transaction(self.get_node(),
-                        Hinawa.FwTcode.READ_QUADLET_REQUEST,
-                        self._BASE_ADDR + offset, 4, frames)
+        return self.trx.read(self._BASE_ADDR + offset, 4)
 
     def write_quadlet(self, offset, frames):
-        req = Hinawa.FwReq()
-        return req.transaction(self.get_node(),
-                        Hinawa.FwTcode.WRITE_QUADLET_REQUEST,
-                        self._BASE_ADDR + offset, 4, frames)
+        self.trx.write(self._BASE_ADDR + offset, frames)
 
     def get_firmware_versions(self):
         info = {}
-        frames = self.read_quadlet(0x0000)
-        info['Register'] = unpack('>I', frames)[0]
-        frames = self.read_quadlet(0x0004)
-        info['FPGA'] = unpack('>I', frames)[0]
-        frames = self.read_quadlet(0x0008)
-        info['ARM'] = unpack('>I', frames)[0]
-        frames = self.read_quadlet(0x000c)
-        info['HW'] = unpack('>I', frames)[0]
+        labels = ('Register', 'FPGA', 'ARM', 'HW')
+        ranges = [(self._BASE_ADDR + i * 4, 4) for i in range(len(labels))]
+        for label, frames in zip(labels, self.trx.read_batch(ranges)):
+            info[label] = unpack('>I', frames)[0]
         return info
 
     def set_clock_source(self, src):
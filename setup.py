@@ -36,6 +36,7 @@ setuptools.setup(
         'hinawa_utils.misc',
         'hinawa_utils.motu',
         'hinawa_utils.oxfw',
+        'hinawa_utils.sim',
         'hinawa_utils.ta1394',
         'hinawa_utils.tscm',
     ),
@@ -44,6 +45,9 @@ setuptools.setup(
         'hinawa-apogee-ensemble-cli',
         'hinawa-apogee-duet-cli',
         'hinawa-bebob-parser',
+        'hinawa-bebob-topology-diff',
+        'hinawa-cli-client',
+        'hinawa-config-rom-bench',
         'hinawa-config-rom-printer',
         'hinawa-dg003-cli',
         'hinawa-dg00x-common-cli',
@@ -57,6 +61,7 @@ setuptools.setup(
         'hinawa-lacie-speakers-cli',
         'hinawa-maudio-bebob-cli',
         'hinawa-motu-common-cli',
+        'hinawa-sim-bench',
         'hinawa-oxfw-generic-cli',
         'hinawa-tascam-fireone-cli',
         'hinawa-tascam-fw-console-cli',
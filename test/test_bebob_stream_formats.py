@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2018 Takashi Sakamoto
+
+import unittest
+from types import SimpleNamespace
+
+from hinawa_utils.sim.sim_fcp import SimFcp
+
+from hinawa_utils.bebob.extensions import BcoPlugInfo, BcoStreamFormatInfo
+from hinawa_utils.bebob.plug_parser import PlugParser
+
+
+class StreamFormatAliasTest(unittest.TestCase):
+    # Compound, 48.0kHz, 2 channels of multi bit linear audio.
+    FORMAT = bytes([0x90, 0x40, 0x04, 0x02, 0x01, 0x02, 0x06])
+
+    def setUp(self):
+        # The first entry of list is the same for both plugs. The second
+        # request falls into 'Not implemented' by default response.
+        self.addrs = [BcoPlugInfo.get_unit_addr('input', 'isoc', i)
+                      for i in range(2)]
+        fcp = []
+        for addr in self.addrs:
+            prefix = bytes([0x01, addr[5], 0x2f, 0xc1]) + bytes(addr[:5]) + \
+                bytes([0xff, 0x00])
+            resp = bytearray(prefix) + self.FORMAT
+            resp[0] = 0x0c
+            fcp.append((prefix, bytes(resp)))
+        self.fcp = SimFcp()
+        self.fcp.bind(SimpleNamespace(profile=SimpleNamespace(fcp=fcp,
+                                                              latency=0)))
+
+    def test_entry_list(self):
+        formats = {}
+        fmts = [BcoStreamFormatInfo.get_entry_list(self.fcp, addr, formats)
+                for addr in self.addrs]
+        self.assertEqual(fmts[0], fmts[1])
+
+        fmts[0][0]['sampling-rate'] = 0
+        fmts[0][0]['formation'].append('reserved')
+        self.assertEqual(fmts[1][0]['sampling-rate'], 48000)
+        self.assertEqual(len(fmts[1][0]['formation']), 2)
+        self.assertEqual(len(formats[self.FORMAT]['formation']), 2)
+
+    def test_plug_parser(self):
+        # Only the cache of parser is required for the method.
+        parser = SimpleNamespace(fcp=self.fcp, _PlugParser__formats={},
+                                 _PlugParser__entry_lists={})
+        fmts = [PlugParser.get_stream_formats(parser, addr)
+                for addr in self.addrs]
+        fmts[0][0]['formation'].clear()
+        self.assertEqual(len(fmts[1][0]['formation']), 2)
+
+        # The cached list is not changed by callers.
+        fmts = PlugParser.get_stream_formats(parser, self.addrs[0])
+        self.assertEqual(len(fmts[0]['formation']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()